@@ -0,0 +1,183 @@
+import argparse
+import json
+import os
+import resource
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import generate_charts as gc
+from validate_books import validate
+from synthetic_catalogue import SOURCE_FILE, OUTPUT_DIR, synthetic_path, write_catalogue
+
+BASELINE_FILE = 'benchmark_baseline.json'
+
+# A stage only counts as regressed if it is both relatively and absolutely slower/bigger,
+# so sub-millisecond stages don't fail on timer noise
+MIN_SECONDS_DELTA = 0.05
+MIN_MEMORY_DELTA_MB = 1.0
+
+
+class StageTimer:
+    """Collects wall time, or with trace_memory the traced peak, for each named stage.
+
+    tracemalloc slows allocation-heavy stages severalfold, so times and memory
+    come from separate passes over the same stages. Every pass adds one sample
+    per stage.
+    """
+
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.samples = {}
+
+    def run(self, stage, func, *args, **kwargs):
+        if not self.trace_memory:
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            self.samples.setdefault(stage, []).append(time.perf_counter() - start)
+            return result
+
+        tracemalloc.reset_peak()
+        # Only count what the stage itself allocates on top of the data already in memory
+        baseline, _ = tracemalloc.get_traced_memory()
+        result = func(*args, **kwargs)
+        _, peak = tracemalloc.get_traced_memory()
+        self.samples.setdefault(stage, []).append((peak - baseline) / 1024 / 1024)
+        return result
+
+
+def run_stages(timer, data_path, dpi, output_dir):
+    df = timer.run('load', gc.load_data, data_path)
+    timer.run('validate', validate, df)
+    df = timer.run('coerce', gc.coerce_types, df)
+    for chart_name, (aggregate, render, panels) in gc.CHARTS.items():
+        agg = timer.run(f'aggregate:{chart_name}', aggregate, df)
+        timer.run(f'panels:{chart_name}', panels, agg)
+        fig = timer.run(f'render:{chart_name}', render, agg)
+        timer.run(f'savefig:{chart_name}', gc.save_chart, fig, os.path.join(output_dir, f'{chart_name}.png'), dpi)
+    return len(df)
+
+
+def benchmark_scale(data_path, dpi, output_dir, repeat):
+    # The lazy pyplot import and style setup is a one-off cost that would otherwise land in the first render
+    gc.pyplot()
+
+    timer = StageTimer()
+    for _ in range(repeat):
+        rows = run_stages(timer, data_path, dpi, output_dir)
+
+    memory = StageTimer(trace_memory=True)
+    tracemalloc.start()
+    try:
+        run_stages(memory, data_path, dpi, output_dir)
+    finally:
+        tracemalloc.stop()
+
+    # The fastest pass is the one least disturbed by other load on the machine
+    stages = {stage: {'seconds': round(min(seconds), 4), 'peak_mb': round(memory.samples[stage][0], 2)}
+              for stage, seconds in timer.samples.items()}
+    return {'rows': rows, 'repeat': repeat, 'stages': stages}
+
+
+def data_path_for(scale, data_dir):
+    if scale == 1:
+        return SOURCE_FILE
+    path = synthetic_path(scale, data_dir)
+    if not os.path.exists(path):
+        print(f"Generating {scale}x synthetic catalogue...")
+        write_catalogue(scale, SOURCE_FILE, path)
+    return path
+
+
+def compare(results, baseline, tolerance):
+    """Return a list of human-readable regressions against the stored baseline"""
+    regressions = []
+    for scale, run in results.items():
+        base_run = baseline.get(scale)
+        if base_run is None:
+            continue
+        for stage, current in run['stages'].items():
+            base = base_run['stages'].get(stage)
+            if base is None:
+                continue
+            if (current['seconds'] > base['seconds'] * (1 + tolerance)
+                    and current['seconds'] - base['seconds'] > MIN_SECONDS_DELTA):
+                regressions.append(f"{scale}x {stage}: {current['seconds']:.3f}s vs baseline {base['seconds']:.3f}s")
+            if (current['peak_mb'] > base['peak_mb'] * (1 + tolerance)
+                    and current['peak_mb'] - base['peak_mb'] > MIN_MEMORY_DELTA_MB):
+                regressions.append(f"{scale}x {stage}: {current['peak_mb']:.1f} MB vs baseline {base['peak_mb']:.1f} MB")
+    return regressions
+
+
+def print_report(scale, run):
+    print(f"\n{'='*60}")
+    print(f"{scale}x scale: {run['rows']:,} rows, best of {run['repeat']} timed passes")
+    print(f"{'='*60}")
+    print(f"{'Stage':<40}{'Time (s)':>10}{'Peak (MB)':>10}")
+    for stage, stats in run['stages'].items():
+        print(f"{stage:<40}{stats['seconds']:>10.3f}{stats['peak_mb']:>10.1f}")
+    total = sum(stats['seconds'] for stats in run['stages'].values())
+    print(f"{'total':<40}{total:>10.3f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time and memory-profile each stage of generate_charts.py')
+    parser.add_argument('--scales', type=int, nargs='+', default=[1, 10, 100],
+                        help='1 = the real file, N = synthetic catalogue with N times the rows (default: 1 10 100)')
+    parser.add_argument('--data-dir', default=OUTPUT_DIR, help=f'Synthetic catalogue directory (default: {OUTPUT_DIR}/)')
+    parser.add_argument('--baseline', default=BASELINE_FILE, help=f'Stored baseline (default: {BASELINE_FILE})')
+    parser.add_argument('--update-baseline', action='store_true', help='Write this run as the new baseline')
+    parser.add_argument('--tolerance', type=float, default=0.25, help='Allowed slowdown/growth vs baseline (default: 0.25)')
+    parser.add_argument('--repeat', type=int, default=5,
+                        help='Timed passes per scale; each stage keeps its fastest time (default: 5)')
+    parser.add_argument('--dpi', type=int, default=300)
+    parser.add_argument('--output', help='Also write this run\'s results to a JSON file')
+    args = parser.parse_args()
+    if args.repeat < 1:
+        parser.error('--repeat must be at least 1')
+
+    results = {}
+    with tempfile.TemporaryDirectory() as chart_dir:
+        for scale in args.scales:
+            run = benchmark_scale(data_path_for(scale, args.data_dir), args.dpi, chart_dir, args.repeat)
+            results[str(scale)] = run
+            print_report(scale, run)
+
+    # ru_maxrss is KB on Linux, bytes on macOS
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    max_rss_mb = max_rss / 1024 / 1024 if sys.platform == 'darwin' else max_rss / 1024
+    print(f"\nProcess peak RSS: {max_rss_mb:.1f} MB")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2)
+
+    if args.update_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+        baseline.update(results)
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --update-baseline to record one")
+        return
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\n❌ {len(regressions)} stage(s) regressed past the baseline (+{args.tolerance:.0%}):")
+        for line in regressions:
+            print(f"  - {line}")
+        sys.exit(1)
+    print(f"\n✅ No regressions against {args.baseline}")
+
+
+if __name__ == '__main__':
+    main()
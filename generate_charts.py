@@ -1,563 +1,1061 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
-from collections import Counter
+import argparse
+import csv
+import json
+import math
+import os
+import shutil
+import sys
+from datetime import datetime
 import warnings
 warnings.filterwarnings('ignore')
 
-# Set style for better readability
-sns.set_style("whitegrid")
-plt.rcParams['figure.figsize'] = (14, 10)
-plt.rcParams['font.size'] = 11
-plt.rcParams['axes.titlesize'] = 16
-plt.rcParams['axes.labelsize'] = 13
-plt.rcParams['xtick.labelsize'] = 10
-plt.rcParams['ytick.labelsize'] = 10
-
-# Load data
-df = pd.read_csv('books_data_20251202_231851.csv')
-
-# Convert numeric columns
-df['retail_price'] = pd.to_numeric(df['retail_price'], errors='coerce')
-df['old_price'] = pd.to_numeric(df['old_price'], errors='coerce')
-df['rating_value'] = pd.to_numeric(df['rating_value'], errors='coerce')
-df['rating_count'] = pd.to_numeric(df['rating_count'], errors='coerce')
-df['seller_rating'] = pd.to_numeric(df['seller_rating'], errors='coerce')
-df['max_installment_months'] = pd.to_numeric(df['max_installment_months'], errors='coerce')
-
-print("Generating business insights charts...")
-print(f"Total records: {len(df)}")
+# pandas, numpy and matplotlib are imported inside the stages that need them, so
+# `--help`, `--check` and `--format json` never pay for the plotting stack.
+
+# Set style for better readability; seaborn's "whitegrid" axes style, inlined
+STYLE = {
+    'figure.facecolor': 'white',
+    'axes.facecolor': 'white',
+    'axes.edgecolor': '.8',
+    'axes.grid': True,
+    'axes.axisbelow': True,
+    'axes.labelcolor': '.15',
+    'axes.spines.left': True,
+    'axes.spines.bottom': True,
+    'axes.spines.right': True,
+    'axes.spines.top': True,
+    'grid.color': '.8',
+    'grid.linestyle': '-',
+    'text.color': '.15',
+    'font.family': ['sans-serif'],
+    'font.sans-serif': ['Arial', 'DejaVu Sans', 'Liberation Sans', 'Bitstream Vera Sans', 'sans-serif'],
+    'lines.solid_capstyle': 'round',
+    'patch.edgecolor': 'w',
+    'patch.force_edgecolor': True,
+    'xtick.direction': 'out',
+    'ytick.direction': 'out',
+    'xtick.color': '.15',
+    'ytick.color': '.15',
+    'xtick.top': False,
+    'ytick.right': False,
+    'xtick.bottom': False,
+    'ytick.left': False,
+    'figure.figsize': (14, 10),
+    'font.size': 11,
+    'axes.titlesize': 16,
+    'axes.labelsize': 13,
+    'xtick.labelsize': 10,
+    'ytick.labelsize': 10,
+}
+
+_pyplot = None
+
+DATA_FILE = 'books_data_20251202_231851.csv'
+CHARTS_DIR = 'charts'
+DASHBOARD_DATA_FILE = 'dashboard_data.json'
+DASHBOARD_PAGE = os.path.join(os.path.dirname(os.path.abspath(__file__)), CHARTS_DIR, 'dashboard.html')
+
+NUMERIC_COLUMNS = ['retail_price', 'old_price', 'rating_value', 'rating_count',
+                   'seller_rating', 'max_installment_months']
+
+SEGMENT_BINS = [0, 5, 10, 20, 50, 1000]
+SEGMENT_LABELS = ['Budget\n(0-5)', 'Economy\n(5-10)', 'Standard\n(10-20)',
+                  'Premium\n(20-50)', 'Luxury\n(50+)']
+
+
+# Columns the aggregations read; checked from the header before pandas is loaded
+REQUIRED_COLUMNS = ['name', 'brand', 'category_name', 'seller_name', 'installment_enabled'] + NUMERIC_COLUMNS
+
+
+def pyplot():
+    """Import pyplot on first render with the headless Agg backend and report style"""
+    global _pyplot
+    if _pyplot is None:
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        plt.rcParams.update(STYLE)
+        _pyplot = plt
+    return _pyplot
+
+
+# ===========================
+# LOAD & COERCE
+# ===========================
+def missing_columns(path):
+    """Read only the CSV header and list required columns it lacks"""
+    with open(path, 'r', newline='', encoding='utf-8-sig') as csvfile:
+        header = next(csv.reader(csvfile), [])
+    return [column for column in REQUIRED_COLUMNS if column not in header]
+
+
+def load_data(path=DATA_FILE):
+    import pandas as pd
+    return pd.read_csv(path)
+
+
+def coerce_types(df):
+    """Convert numeric columns and derive discount fields used by the charts"""
+    import pandas as pd
+    from validate_books import BOOL_VALUES
+    for column in NUMERIC_COLUMNS:
+        df[column] = pd.to_numeric(df[column], errors='coerce')
+    if not pd.api.types.is_bool_dtype(df['installment_enabled']):
+        # A single bad cell makes read_csv keep the column as text, which breaks `== True`
+        df['installment_enabled'] = df['installment_enabled'].map(BOOL_VALUES)
+    df['has_discount'] = df['old_price'] > df['retail_price']
+    df['discount_percent'] = ((df['old_price'] - df['retail_price']) / df['old_price'] * 100).fillna(0)
+    return df
+
+
+def histogram(values, bins):
+    """Pre-bin values so charts only draw counts, not raw rows"""
+    import numpy as np
+    counts, edges = np.histogram(values, bins=bins)
+    return {'counts': counts, 'edges': edges}
+
+
+def box_stats(values, label, whis=1.5):
+    """Box-and-whisker statistics as computed by matplotlib.cbook.boxplot_stats"""
+    import numpy as np
+    x = np.asarray(values, dtype=float)
+    if len(x) == 0:
+        return {'label': label, 'mean': np.nan, 'med': np.nan, 'q1': np.nan, 'q3': np.nan, 'iqr': np.nan,
+                'cilo': np.nan, 'cihi': np.nan, 'whislo': np.nan, 'whishi': np.nan, 'fliers': np.array([])}
+
+    q1, med, q3 = np.percentile(x, [25, 50, 75])
+    iqr = q3 - q1
+    within_hi = x[x <= q3 + whis * iqr]
+    within_lo = x[x >= q1 - whis * iqr]
+    whishi = q3 if len(within_hi) == 0 or np.max(within_hi) < q3 else np.max(within_hi)
+    whislo = q1 if len(within_lo) == 0 or np.min(within_lo) > q1 else np.min(within_lo)
+    notch = 1.57 * iqr / np.sqrt(len(x))
+    return {
+        'label': label, 'mean': np.mean(x), 'med': med, 'q1': q1, 'q3': q3, 'iqr': iqr,
+        'cilo': med - notch, 'cihi': med + notch, 'whislo': whislo, 'whishi': whishi,
+        'fliers': np.concatenate([x[x < whislo], x[x > whishi]]),
+    }
+
+
+def draw_histogram(ax, hist, **kwargs):
+    edges = hist['edges']
+    ax.hist(edges[:-1], bins=edges, weights=hist['counts'], **kwargs)
+
+
+def installment_counts(df):
+    """True/False counts in that order, with 0 for a side that has no books"""
+    return df['installment_enabled'].value_counts().reindex([True, False], fill_value=0)
+
+
+def price_segment_counts(df):
+    import pandas as pd
+    price_segments = pd.cut(df['retail_price'], bins=SEGMENT_BINS, labels=SEGMENT_LABELS)
+    return price_segments.value_counts().sort_index()
+
+
+def style_pie_labels(autotexts):
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+
+def panel(kind, title, labels=None, values=None, **options):
+    """Describe one dashboard panel; dashboard.html draws it client-side"""
+    spec = {'type': kind, 'title': title}
+    if labels is not None:
+        spec['labels'] = [str(label).replace('\n', ' ') for label in labels]
+    if values is not None:
+        spec['values'] = list(values)
+    spec.update(options)
+    return spec
+
+
+def hist_panel(title, hist, color, lines=(), **options):
+    return panel('hist', title, edges=hist['edges'], counts=hist['counts'], color=color, lines=list(lines), **options)
+
+
+def share_text(values, total):
+    return [f'{v} ({v/total*100:.1f}%)' for v in values]
+
 
 # ===========================
 # 1. PRICE DISTRIBUTION & STRATEGY
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('📊 Pricing Strategy Analysis', fontsize=18, fontweight='bold')
-
-# 1.1 Price Distribution
-ax1 = axes[0, 0]
-prices = df['retail_price'].dropna()
-ax1.hist(prices[prices <= 50], bins=50, color='#2ecc71', alpha=0.7, edgecolor='black')
-ax1.axvline(prices.median(), color='red', linestyle='--', linewidth=2, label=f'Median: {prices.median():.2f} AZN')
-ax1.axvline(prices.mean(), color='blue', linestyle='--', linewidth=2, label=f'Mean: {prices.mean():.2f} AZN')
-ax1.set_xlabel('Price (AZN)')
-ax1.set_ylabel('Number of Books')
-ax1.set_title('Price Distribution (Books ≤50 AZN)')
-ax1.legend()
-ax1.grid(True, alpha=0.3)
-
-# 1.2 Discount Analysis
-ax2 = axes[0, 1]
-df['has_discount'] = df['old_price'] > df['retail_price']
-df['discount_percent'] = ((df['old_price'] - df['retail_price']) / df['old_price'] * 100).fillna(0)
-discount_books = df[df['has_discount']]
-discount_summary = {
-    'Books with Discount': len(discount_books),
-    'Books without Discount': len(df) - len(discount_books)
-}
-colors = ['#e74c3c', '#95a5a6']
-wedges, texts, autotexts = ax2.pie(discount_summary.values(), labels=discount_summary.keys(),
-                                     autopct='%1.1f%%', colors=colors, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax2.set_title(f'Discount Availability\nAvg Discount: {discount_books["discount_percent"].mean():.1f}%')
-
-# 1.3 Price Segments
-ax3 = axes[1, 0]
-price_segments = pd.cut(df['retail_price'], bins=[0, 5, 10, 20, 50, 1000],
-                        labels=['Budget\n(0-5)', 'Economy\n(5-10)', 'Standard\n(10-20)',
-                               'Premium\n(20-50)', 'Luxury\n(50+)'])
-segment_counts = price_segments.value_counts().sort_index()
-bars = ax3.bar(segment_counts.index, segment_counts.values, color=['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6'])
-ax3.set_ylabel('Number of Books')
-ax3.set_title('Market Segmentation by Price')
-ax3.grid(True, alpha=0.3, axis='y')
-for bar in bars:
-    height = bar.get_height()
-    ax3.text(bar.get_x() + bar.get_width()/2., height,
-            f'{int(height)}\n({height/len(df)*100:.1f}%)',
-            ha='center', va='bottom', fontweight='bold')
-
-# 1.4 Top 10 Most Expensive Books
-ax4 = axes[1, 1]
-top_expensive = df.nlargest(10, 'retail_price')[['name', 'retail_price']].copy()
-top_expensive['short_name'] = top_expensive['name'].str[:35] + '...'
-bars = ax4.barh(range(len(top_expensive)), top_expensive['retail_price'], color='#e67e22')
-ax4.set_yticks(range(len(top_expensive)))
-ax4.set_yticklabels(top_expensive['short_name'], fontsize=9)
-ax4.set_xlabel('Price (AZN)', fontsize=12)
-ax4.set_title('Top 10 Most Expensive Books', fontsize=14, pad=10)
-ax4.invert_yaxis()
-for i, (idx, row) in enumerate(top_expensive.iterrows()):
-    ax4.text(row['retail_price'] + 2, i, f'{row["retail_price"]:.0f}',
-            va='center', fontsize=9)
-
-plt.tight_layout()
-plt.savefig('charts/1_pricing_strategy.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 1_pricing_strategy.png")
-plt.close()
+def aggregate_pricing(df):
+    prices = df['retail_price'].dropna()
+    discount_books = df[df['has_discount']]
+    top_expensive = df.nlargest(10, 'retail_price')[['name', 'retail_price']].copy()
+    top_expensive['short_name'] = top_expensive['name'].str[:35] + '...'
+    return {
+        'total': len(df),
+        'price_hist': histogram(prices[prices <= 50], bins=50),
+        'price_median': prices.median(),
+        'price_mean': prices.mean(),
+        'discount_summary': {
+            'Books with Discount': len(discount_books),
+            'Books without Discount': len(df) - len(discount_books)
+        },
+        'avg_discount': discount_books['discount_percent'].mean(),
+        'segment_counts': price_segment_counts(df),
+        'top_expensive': top_expensive[['short_name', 'retail_price']],
+    }
+
+
+def render_pricing(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('📊 Pricing Strategy Analysis', fontsize=18, fontweight='bold')
+
+    # 1.1 Price Distribution
+    ax1 = axes[0, 0]
+    draw_histogram(ax1, agg['price_hist'], color='#2ecc71', alpha=0.7, edgecolor='black')
+    ax1.axvline(agg['price_median'], color='red', linestyle='--', linewidth=2, label=f'Median: {agg["price_median"]:.2f} AZN')
+    ax1.axvline(agg['price_mean'], color='blue', linestyle='--', linewidth=2, label=f'Mean: {agg["price_mean"]:.2f} AZN')
+    ax1.set_xlabel('Price (AZN)')
+    ax1.set_ylabel('Number of Books')
+    ax1.set_title('Price Distribution (Books ≤50 AZN)')
+    ax1.legend()
+    ax1.grid(True, alpha=0.3)
+
+    # 1.2 Discount Analysis
+    ax2 = axes[0, 1]
+    discount_summary = agg['discount_summary']
+    colors = ['#e74c3c', '#95a5a6']
+    wedges, texts, autotexts = ax2.pie(discount_summary.values(), labels=discount_summary.keys(),
+                                         autopct='%1.1f%%', colors=colors, startangle=90)
+    style_pie_labels(autotexts)
+    ax2.set_title(f'Discount Availability\nAvg Discount: {agg["avg_discount"]:.1f}%')
+
+    # 1.3 Price Segments
+    ax3 = axes[1, 0]
+    segment_counts = agg['segment_counts']
+    bars = ax3.bar(segment_counts.index, segment_counts.values, color=['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6'])
+    ax3.set_ylabel('Number of Books')
+    ax3.set_title('Market Segmentation by Price')
+    ax3.grid(True, alpha=0.3, axis='y')
+    for bar in bars:
+        height = bar.get_height()
+        ax3.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}\n({height/agg["total"]*100:.1f}%)',
+                ha='center', va='bottom', fontweight='bold')
+
+    # 1.4 Top 10 Most Expensive Books
+    ax4 = axes[1, 1]
+    top_expensive = agg['top_expensive']
+    ax4.barh(range(len(top_expensive)), top_expensive['retail_price'], color='#e67e22')
+    ax4.set_yticks(range(len(top_expensive)))
+    ax4.set_yticklabels(top_expensive['short_name'], fontsize=9)
+    ax4.set_xlabel('Price (AZN)', fontsize=12)
+    ax4.set_title('Top 10 Most Expensive Books', fontsize=14, pad=10)
+    ax4.invert_yaxis()
+    for i, price in enumerate(top_expensive['retail_price']):
+        ax4.text(price + 2, i, f'{price:.0f}', va='center', fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_pricing(agg):
+    segment_counts = agg['segment_counts']
+    top_expensive = agg['top_expensive']
+    return [
+        hist_panel('Price Distribution (Books ≤50 AZN)', agg['price_hist'], '#2ecc71',
+                   lines=[{'x': agg['price_median'], 'color': 'red', 'label': f'Median: {agg["price_median"]:.2f} AZN'},
+                          {'x': agg['price_mean'], 'color': 'blue', 'label': f'Mean: {agg["price_mean"]:.2f} AZN'}],
+                   xlabel='Price (AZN)', ylabel='Number of Books'),
+        panel('pie', f'Discount Availability (Avg Discount: {agg["avg_discount"]:.1f}%)',
+              agg['discount_summary'].keys(), agg['discount_summary'].values(), colors=['#e74c3c', '#95a5a6']),
+        panel('bar', 'Market Segmentation by Price', segment_counts.index, segment_counts.values,
+              colors=['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6'],
+              text=share_text(segment_counts.values, agg['total']), ylabel='Number of Books'),
+        panel('barh', 'Top 10 Most Expensive Books', top_expensive['short_name'], top_expensive['retail_price'],
+              color='#e67e22', text=[f'{v:.0f}' for v in top_expensive['retail_price']], xlabel='Price (AZN)'),
+    ]
+
 
 # ===========================
 # 2. CATEGORY ANALYSIS
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('📚 Category & Market Composition Analysis', fontsize=18, fontweight='bold')
-
-# 2.1 Top 12 Categories (reduced for readability)
-ax1 = axes[0, 0]
-top_categories = df['category_name'].value_counts().head(12)
-bars = ax1.barh(range(len(top_categories)), top_categories.values, color='#3498db')
-ax1.set_yticks(range(len(top_categories)))
-ax1.set_yticklabels([name[:30] for name in top_categories.index], fontsize=10)
-ax1.set_xlabel('Number of Books', fontsize=12)
-ax1.set_title('Top 12 Categories by Volume', fontsize=14, pad=10)
-ax1.invert_yaxis()
-for i, v in enumerate(top_categories.values):
-    ax1.text(v + 20, i, f'{v}', va='center', fontsize=9)
-
-# 2.2 Category by Average Price
-ax2 = axes[0, 1]
-category_prices = df.groupby('category_name')['retail_price'].agg(['mean', 'count']).sort_values('mean', ascending=False)
-top_price_cats = category_prices[category_prices['count'] >= 20].head(10)  # At least 20 books
-bars = ax2.barh(range(len(top_price_cats)), top_price_cats['mean'], color='#2ecc71')
-ax2.set_yticks(range(len(top_price_cats)))
-ax2.set_yticklabels(top_price_cats.index, fontsize=9)
-ax2.set_xlabel('Average Price (AZN)')
-ax2.set_title('Top 10 Categories by Average Price\n(min 20 books)')
-ax2.invert_yaxis()
-for i, v in enumerate(top_price_cats['mean']):
-    ax2.text(v, i, f' {v:.1f} AZN', va='center', fontweight='bold')
-
-# 2.3 Market Share - Top Categories
-ax3 = axes[1, 0]
-top_5_cats = df['category_name'].value_counts().head(5)
-others = df['category_name'].value_counts().iloc[5:].sum()
-pie_data = list(top_5_cats.values) + [others]
-pie_labels = list(top_5_cats.index) + ['Others']
-colors_pie = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#95a5a6']
-wedges, texts, autotexts = ax3.pie(pie_data, labels=pie_labels, autopct='%1.1f%%',
-                                     colors=colors_pie, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax3.set_title('Market Share: Top 5 Categories vs Others')
-
-# 2.4 Books per Category Distribution
-ax4 = axes[1, 1]
-books_per_cat = df['category_name'].value_counts().values
-ax4.hist(books_per_cat, bins=30, color='#9b59b6', alpha=0.7, edgecolor='black')
-ax4.axvline(np.median(books_per_cat), color='red', linestyle='--', linewidth=2,
-           label=f'Median: {np.median(books_per_cat):.0f} books')
-ax4.set_xlabel('Books per Category')
-ax4.set_ylabel('Number of Categories')
-ax4.set_title('Distribution of Books Across Categories')
-ax4.legend()
-ax4.grid(True, alpha=0.3)
-
-plt.tight_layout()
-plt.savefig('charts/2_category_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 2_category_analysis.png")
-plt.close()
+def aggregate_category(df):
+    category_counts = df['category_name'].value_counts()
+    category_prices = df.groupby('category_name')['retail_price'].agg(['mean', 'count']).sort_values('mean', ascending=False)
+    books_per_cat = category_counts.values
+    return {
+        'top_categories': category_counts.head(12),
+        'top_price_cats': category_prices[category_prices['count'] >= 20].head(10)['mean'],  # At least 20 books
+        'top_5_cats': category_counts.head(5),
+        'others': category_counts.iloc[5:].sum(),
+        'books_per_cat_hist': histogram(books_per_cat, bins=30),
+        'books_per_cat_median': category_counts.median(),
+    }
+
+
+def render_category(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('📚 Category & Market Composition Analysis', fontsize=18, fontweight='bold')
+
+    # 2.1 Top 12 Categories (reduced for readability)
+    ax1 = axes[0, 0]
+    top_categories = agg['top_categories']
+    ax1.barh(range(len(top_categories)), top_categories.values, color='#3498db')
+    ax1.set_yticks(range(len(top_categories)))
+    ax1.set_yticklabels([name[:30] for name in top_categories.index], fontsize=10)
+    ax1.set_xlabel('Number of Books', fontsize=12)
+    ax1.set_title('Top 12 Categories by Volume', fontsize=14, pad=10)
+    ax1.invert_yaxis()
+    for i, v in enumerate(top_categories.values):
+        ax1.text(v + 20, i, f'{v}', va='center', fontsize=9)
+
+    # 2.2 Category by Average Price
+    ax2 = axes[0, 1]
+    top_price_cats = agg['top_price_cats']
+    ax2.barh(range(len(top_price_cats)), top_price_cats.values, color='#2ecc71')
+    ax2.set_yticks(range(len(top_price_cats)))
+    ax2.set_yticklabels(top_price_cats.index, fontsize=9)
+    ax2.set_xlabel('Average Price (AZN)')
+    ax2.set_title('Top 10 Categories by Average Price\n(min 20 books)')
+    ax2.invert_yaxis()
+    for i, v in enumerate(top_price_cats.values):
+        ax2.text(v, i, f' {v:.1f} AZN', va='center', fontweight='bold')
+
+    # 2.3 Market Share - Top Categories
+    ax3 = axes[1, 0]
+    top_5_cats = agg['top_5_cats']
+    pie_data = list(top_5_cats.values) + [agg['others']]
+    pie_labels = list(top_5_cats.index) + ['Others']
+    colors_pie = ['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#95a5a6']
+    wedges, texts, autotexts = ax3.pie(pie_data, labels=pie_labels, autopct='%1.1f%%',
+                                         colors=colors_pie, startangle=90)
+    style_pie_labels(autotexts)
+    ax3.set_title('Market Share: Top 5 Categories vs Others')
+
+    # 2.4 Books per Category Distribution
+    ax4 = axes[1, 1]
+    draw_histogram(ax4, agg['books_per_cat_hist'], color='#9b59b6', alpha=0.7, edgecolor='black')
+    ax4.axvline(agg['books_per_cat_median'], color='red', linestyle='--', linewidth=2,
+               label=f'Median: {agg["books_per_cat_median"]:.0f} books')
+    ax4.set_xlabel('Books per Category')
+    ax4.set_ylabel('Number of Categories')
+    ax4.set_title('Distribution of Books Across Categories')
+    ax4.legend()
+    ax4.grid(True, alpha=0.3)
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_category(agg):
+    top_categories = agg['top_categories']
+    top_price_cats = agg['top_price_cats']
+    top_5_cats = agg['top_5_cats']
+    return [
+        panel('barh', 'Top 12 Categories by Volume', [name[:30] for name in top_categories.index],
+              top_categories.values, color='#3498db', xlabel='Number of Books'),
+        panel('barh', 'Top 10 Categories by Average Price (min 20 books)', top_price_cats.index, top_price_cats.values,
+              color='#2ecc71', text=[f'{v:.1f} AZN' for v in top_price_cats.values], xlabel='Average Price (AZN)'),
+        panel('pie', 'Market Share: Top 5 Categories vs Others', list(top_5_cats.index) + ['Others'],
+              list(top_5_cats.values) + [agg['others']],
+              colors=['#e74c3c', '#3498db', '#2ecc71', '#f39c12', '#9b59b6', '#95a5a6']),
+        hist_panel('Distribution of Books Across Categories', agg['books_per_cat_hist'], '#9b59b6',
+                   lines=[{'x': agg['books_per_cat_median'], 'color': 'red',
+                           'label': f'Median: {agg["books_per_cat_median"]:.0f} books'}],
+                   xlabel='Books per Category', ylabel='Number of Categories'),
+    ]
+
 
 # ===========================
 # 3. SELLER ANALYSIS
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('🏪 Seller Performance & Market Share Analysis', fontsize=18, fontweight='bold')
-
-# 3.1 Top 10 Sellers by Volume
-ax1 = axes[0, 0]
-top_sellers = df['seller_name'].value_counts().head(10)
-bars = ax1.barh(range(len(top_sellers)), top_sellers.values, color='#e67e22')
-ax1.set_yticks(range(len(top_sellers)))
-ax1.set_yticklabels(top_sellers.index, fontsize=9)
-ax1.set_xlabel('Number of Books')
-ax1.set_title('Top 10 Sellers by Catalog Size')
-ax1.invert_yaxis()
-for i, v in enumerate(top_sellers.values):
-    ax1.text(v, i, f' {v} ({v/len(df)*100:.1f}%)', va='center', fontweight='bold', fontsize=9)
-
-# 3.2 Seller Rating Distribution
-ax2 = axes[0, 1]
-seller_ratings = df.groupby('seller_name').agg({
-    'seller_rating': 'first',
-    'name': 'count'
-}).rename(columns={'name': 'book_count'})
-seller_ratings = seller_ratings[seller_ratings['book_count'] >= 10].sort_values('seller_rating', ascending=False).head(15)
-bars = ax2.barh(range(len(seller_ratings)), seller_ratings['seller_rating'], color='#1abc9c')
-ax2.set_yticks(range(len(seller_ratings)))
-ax2.set_yticklabels(seller_ratings.index, fontsize=8)
-ax2.set_xlabel('Seller Rating (%)')
-ax2.set_title('Top 15 Sellers by Rating\n(min 10 books)')
-ax2.invert_yaxis()
-ax2.set_xlim(70, 100)
-for i, v in enumerate(seller_ratings['seller_rating']):
-    ax2.text(v, i, f' {v:.0f}%', va='center', fontweight='bold')
-
-# 3.3 Market Concentration
-ax3 = axes[1, 0]
-top_3_sellers = df['seller_name'].value_counts().head(3)
-top_10_sellers = df['seller_name'].value_counts().head(10).sum()
-others = len(df) - top_10_sellers
-market_data = {
-    f'Top 3 Sellers': top_3_sellers.sum(),
-    f'Other Top 10': top_10_sellers - top_3_sellers.sum(),
-    'All Others': others
-}
-colors_market = ['#e74c3c', '#f39c12', '#95a5a6']
-wedges, texts, autotexts = ax3.pie(market_data.values(), labels=market_data.keys(),
-                                     autopct='%1.1f%%', colors=colors_market, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax3.set_title('Market Concentration Analysis')
-
-# 3.4 Seller Performance: Rating vs Catalog Size
-ax4 = axes[1, 1]
-seller_perf = df.groupby('seller_name').agg({
-    'seller_rating': 'first',
-    'name': 'count'
-}).rename(columns={'name': 'book_count'})
-seller_perf = seller_perf[seller_perf['book_count'] >= 5]
-scatter = ax4.scatter(seller_perf['book_count'], seller_perf['seller_rating'],
-                      s=seller_perf['book_count']*2, alpha=0.6, c=seller_perf['seller_rating'],
-                      cmap='RdYlGn', edgecolors='black', linewidth=0.5)
-ax4.set_xlabel('Catalog Size (Number of Books)')
-ax4.set_ylabel('Seller Rating (%)')
-ax4.set_title('Seller Performance: Rating vs Catalog Size\n(bubble size = catalog size)')
-ax4.grid(True, alpha=0.3)
-plt.colorbar(scatter, ax=ax4, label='Rating %')
-
-# Annotate top sellers
-top_5 = seller_perf.nlargest(5, 'book_count')
-for idx, row in top_5.iterrows():
-    ax4.annotate(idx, (row['book_count'], row['seller_rating']),
-                fontsize=7, alpha=0.7, xytext=(5, 5), textcoords='offset points')
-
-plt.tight_layout()
-plt.savefig('charts/3_seller_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 3_seller_analysis.png")
-plt.close()
+def aggregate_seller(df):
+    seller_counts = df['seller_name'].value_counts()
+    seller_stats = df.groupby('seller_name').agg({
+        'seller_rating': 'first',
+        'name': 'count'
+    }).rename(columns={'name': 'book_count'})
+    seller_ratings = seller_stats[seller_stats['book_count'] >= 10].sort_values('seller_rating', ascending=False).head(15)
+    seller_perf = seller_stats[seller_stats['book_count'] >= 5]
+
+    top_3_sellers = seller_counts.head(3).sum()
+    top_10_sellers = seller_counts.head(10).sum()
+    return {
+        'total': len(df),
+        'top_sellers': seller_counts.head(10),
+        'seller_ratings': seller_ratings['seller_rating'],
+        'market_data': {
+            'Top 3 Sellers': top_3_sellers,
+            'Other Top 10': top_10_sellers - top_3_sellers,
+            'All Others': len(df) - top_10_sellers
+        },
+        'seller_perf': seller_perf,
+        'top_5_perf': seller_perf.nlargest(5, 'book_count'),
+    }
+
+
+def render_seller(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('🏪 Seller Performance & Market Share Analysis', fontsize=18, fontweight='bold')
+
+    # 3.1 Top 10 Sellers by Volume
+    ax1 = axes[0, 0]
+    top_sellers = agg['top_sellers']
+    ax1.barh(range(len(top_sellers)), top_sellers.values, color='#e67e22')
+    ax1.set_yticks(range(len(top_sellers)))
+    ax1.set_yticklabels(top_sellers.index, fontsize=9)
+    ax1.set_xlabel('Number of Books')
+    ax1.set_title('Top 10 Sellers by Catalog Size')
+    ax1.invert_yaxis()
+    for i, v in enumerate(top_sellers.values):
+        ax1.text(v, i, f' {v} ({v/agg["total"]*100:.1f}%)', va='center', fontweight='bold', fontsize=9)
+
+    # 3.2 Seller Rating Distribution
+    ax2 = axes[0, 1]
+    seller_ratings = agg['seller_ratings']
+    ax2.barh(range(len(seller_ratings)), seller_ratings.values, color='#1abc9c')
+    ax2.set_yticks(range(len(seller_ratings)))
+    ax2.set_yticklabels(seller_ratings.index, fontsize=8)
+    ax2.set_xlabel('Seller Rating (%)')
+    ax2.set_title('Top 15 Sellers by Rating\n(min 10 books)')
+    ax2.invert_yaxis()
+    ax2.set_xlim(70, 100)
+    for i, v in enumerate(seller_ratings.values):
+        ax2.text(v, i, f' {v:.0f}%', va='center', fontweight='bold')
+
+    # 3.3 Market Concentration
+    ax3 = axes[1, 0]
+    market_data = agg['market_data']
+    colors_market = ['#e74c3c', '#f39c12', '#95a5a6']
+    wedges, texts, autotexts = ax3.pie(market_data.values(), labels=market_data.keys(),
+                                         autopct='%1.1f%%', colors=colors_market, startangle=90)
+    style_pie_labels(autotexts)
+    ax3.set_title('Market Concentration Analysis')
+
+    # 3.4 Seller Performance: Rating vs Catalog Size
+    ax4 = axes[1, 1]
+    seller_perf = agg['seller_perf']
+    scatter = ax4.scatter(seller_perf['book_count'], seller_perf['seller_rating'],
+                          s=seller_perf['book_count']*2, alpha=0.6, c=seller_perf['seller_rating'],
+                          cmap='RdYlGn', edgecolors='black', linewidth=0.5)
+    ax4.set_xlabel('Catalog Size (Number of Books)')
+    ax4.set_ylabel('Seller Rating (%)')
+    ax4.set_title('Seller Performance: Rating vs Catalog Size\n(bubble size = catalog size)')
+    ax4.grid(True, alpha=0.3)
+    plt.colorbar(scatter, ax=ax4, label='Rating %')
+
+    # Annotate top sellers
+    for idx, row in agg['top_5_perf'].iterrows():
+        ax4.annotate(idx, (row['book_count'], row['seller_rating']),
+                    fontsize=7, alpha=0.7, xytext=(5, 5), textcoords='offset points')
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_seller(agg):
+    top_sellers = agg['top_sellers']
+    seller_ratings = agg['seller_ratings']
+    seller_perf = agg['seller_perf']
+    return [
+        panel('barh', 'Top 10 Sellers by Catalog Size', top_sellers.index, top_sellers.values,
+              color='#e67e22', text=share_text(top_sellers.values, agg['total']), xlabel='Number of Books'),
+        panel('barh', 'Top 15 Sellers by Rating (min 10 books)', seller_ratings.index, seller_ratings.values,
+              color='#1abc9c', text=[f'{v:.0f}%' for v in seller_ratings.values], xlim=[70, 100],
+              xlabel='Seller Rating (%)'),
+        panel('pie', 'Market Concentration Analysis', agg['market_data'].keys(), agg['market_data'].values(),
+              colors=['#e74c3c', '#f39c12', '#95a5a6']),
+        panel('scatter', 'Seller Performance: Rating vs Catalog Size (bubble size = catalog size)',
+              seller_perf.index, x=seller_perf['book_count'].values, y=seller_perf['seller_rating'].values,
+              size=(seller_perf['book_count'] * 2).values, color_values=seller_perf['seller_rating'].values,
+              annotate=list(agg['top_5_perf'].index),
+              xlabel='Catalog Size (Number of Books)', ylabel='Seller Rating (%)'),
+    ]
+
 
 # ===========================
 # 4. RATING & CUSTOMER SATISFACTION
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('⭐ Customer Ratings & Satisfaction Analysis', fontsize=18, fontweight='bold')
-
-# 4.1 Rating Distribution
-ax1 = axes[0, 0]
-rated_books = df[df['rating_value'] > 0]
-rating_counts = rated_books['rating_value'].value_counts().sort_index()
-bars = ax1.bar(rating_counts.index, rating_counts.values, color='#f39c12', edgecolor='black')
-ax1.set_xlabel('Rating (Stars)')
-ax1.set_ylabel('Number of Books')
-ax1.set_title(f'Rating Distribution\n({len(rated_books)} rated books out of {len(df)} total)')
-ax1.set_xticks([1, 2, 3, 4, 5])
-for bar in bars:
-    height = bar.get_height()
-    ax1.text(bar.get_x() + bar.get_width()/2., height,
-            f'{int(height)}\n({height/len(rated_books)*100:.1f}%)',
-            ha='center', va='bottom', fontweight='bold')
-
-# 4.2 Review Engagement
-ax2 = axes[0, 1]
-rating_status = {
-    'Rated Books': len(rated_books),
-    'Unrated Books': len(df) - len(rated_books)
-}
-colors_rating = ['#2ecc71', '#e74c3c']
-wedges, texts, autotexts = ax2.pie(rating_status.values(), labels=rating_status.keys(),
-                                     autopct='%1.1f%%', colors=colors_rating, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax2.set_title('Customer Review Engagement')
-
-# 4.3 Most Reviewed Books (Top 15)
-ax3 = axes[1, 0]
-most_reviewed = df.nlargest(15, 'rating_count')[['name', 'rating_count', 'rating_value']].copy()
-most_reviewed['short_name'] = most_reviewed['name'].str[:35] + '...'
-bars = ax3.barh(range(len(most_reviewed)), most_reviewed['rating_count'])
-# Color by rating
-colors_bars = plt.cm.RdYlGn(most_reviewed['rating_value'] / 5.0)
-for i, (bar, color) in enumerate(zip(bars, colors_bars)):
-    bar.set_color(color)
-ax3.set_yticks(range(len(most_reviewed)))
-ax3.set_yticklabels(most_reviewed['short_name'], fontsize=8)
-ax3.set_xlabel('Number of Reviews')
-ax3.set_title('Top 15 Most Reviewed Books\n(color: rating quality)')
-ax3.invert_yaxis()
-for i, row in most_reviewed.iterrows():
-    idx = list(most_reviewed.index).index(i)
-    ax3.text(row['rating_count'], idx, f' {int(row["rating_count"])} (★{row["rating_value"]:.1f})',
-            va='center', fontsize=7)
-
-# 4.4 Price vs Rating Correlation
-ax4 = axes[1, 1]
-price_rating_df = df[(df['rating_value'] > 0) & (df['retail_price'] <= 50)].copy()
-scatter = ax4.scatter(price_rating_df['retail_price'], price_rating_df['rating_value'],
-                     s=price_rating_df['rating_count']*3, alpha=0.5,
-                     c=price_rating_df['rating_value'], cmap='RdYlGn',
-                     edgecolors='black', linewidth=0.5)
-ax4.set_xlabel('Price (AZN)')
-ax4.set_ylabel('Rating (Stars)')
-ax4.set_title('Price vs Rating Correlation\n(bubble size = review count)')
-ax4.grid(True, alpha=0.3)
-ax4.set_ylim(0, 5.5)
-plt.colorbar(scatter, ax=ax4, label='Rating')
-
-# Add trend line
-z = np.polyfit(price_rating_df['retail_price'], price_rating_df['rating_value'], 1)
-p = np.poly1d(z)
-ax4.plot(price_rating_df['retail_price'].sort_values(),
-        p(price_rating_df['retail_price'].sort_values()),
-        "r--", alpha=0.8, linewidth=2, label='Trend')
-ax4.legend()
-
-plt.tight_layout()
-plt.savefig('charts/4_rating_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 4_rating_analysis.png")
-plt.close()
+def aggregate_rating(df):
+    import numpy as np
+    rated_books = df[df['rating_value'] > 0]
+    most_reviewed = df.nlargest(15, 'rating_count')[['name', 'rating_count', 'rating_value']].copy()
+    most_reviewed['short_name'] = most_reviewed['name'].str[:35] + '...'
+    price_rating_df = df[(df['rating_value'] > 0) & (df['retail_price'] <= 50)]
+    return {
+        'total': len(df),
+        'rated': len(rated_books),
+        'rating_counts': rated_books['rating_value'].value_counts().sort_index(),
+        'most_reviewed': most_reviewed[['short_name', 'rating_count', 'rating_value']],
+        'price_rating': price_rating_df[['retail_price', 'rating_value', 'rating_count']],
+        'trend': np.polyfit(price_rating_df['retail_price'], price_rating_df['rating_value'], 1),
+    }
+
+
+def render_rating(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('⭐ Customer Ratings & Satisfaction Analysis', fontsize=18, fontweight='bold')
+
+    # 4.1 Rating Distribution
+    ax1 = axes[0, 0]
+    rating_counts = agg['rating_counts']
+    bars = ax1.bar(rating_counts.index, rating_counts.values, color='#f39c12', edgecolor='black')
+    ax1.set_xlabel('Rating (Stars)')
+    ax1.set_ylabel('Number of Books')
+    ax1.set_title(f'Rating Distribution\n({agg["rated"]} rated books out of {agg["total"]} total)')
+    ax1.set_xticks([1, 2, 3, 4, 5])
+    for bar in bars:
+        height = bar.get_height()
+        ax1.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}\n({height/agg["rated"]*100:.1f}%)',
+                ha='center', va='bottom', fontweight='bold')
+
+    # 4.2 Review Engagement
+    ax2 = axes[0, 1]
+    rating_status = {
+        'Rated Books': agg['rated'],
+        'Unrated Books': agg['total'] - agg['rated']
+    }
+    colors_rating = ['#2ecc71', '#e74c3c']
+    wedges, texts, autotexts = ax2.pie(rating_status.values(), labels=rating_status.keys(),
+                                         autopct='%1.1f%%', colors=colors_rating, startangle=90)
+    style_pie_labels(autotexts)
+    ax2.set_title('Customer Review Engagement')
+
+    # 4.3 Most Reviewed Books (Top 15)
+    ax3 = axes[1, 0]
+    most_reviewed = agg['most_reviewed']
+    bars = ax3.barh(range(len(most_reviewed)), most_reviewed['rating_count'])
+    # Color by rating
+    colors_bars = plt.cm.RdYlGn(most_reviewed['rating_value'] / 5.0)
+    for bar, color in zip(bars, colors_bars):
+        bar.set_color(color)
+    ax3.set_yticks(range(len(most_reviewed)))
+    ax3.set_yticklabels(most_reviewed['short_name'], fontsize=8)
+    ax3.set_xlabel('Number of Reviews')
+    ax3.set_title('Top 15 Most Reviewed Books\n(color: rating quality)')
+    ax3.invert_yaxis()
+    for i, (count, value) in enumerate(zip(most_reviewed['rating_count'], most_reviewed['rating_value'])):
+        ax3.text(count, i, f' {int(count)} (★{value:.1f})', va='center', fontsize=7)
+
+    # 4.4 Price vs Rating Correlation
+    ax4 = axes[1, 1]
+    price_rating_df = agg['price_rating']
+    scatter = ax4.scatter(price_rating_df['retail_price'], price_rating_df['rating_value'],
+                         s=price_rating_df['rating_count']*3, alpha=0.5,
+                         c=price_rating_df['rating_value'], cmap='RdYlGn',
+                         edgecolors='black', linewidth=0.5)
+    ax4.set_xlabel('Price (AZN)')
+    ax4.set_ylabel('Rating (Stars)')
+    ax4.set_title('Price vs Rating Correlation\n(bubble size = review count)')
+    ax4.grid(True, alpha=0.3)
+    ax4.set_ylim(0, 5.5)
+    plt.colorbar(scatter, ax=ax4, label='Rating')
+
+    # Add trend line
+    slope, intercept = agg['trend']
+    trend_x = price_rating_df['retail_price'].sort_values()
+    ax4.plot(trend_x, slope * trend_x + intercept, "r--", alpha=0.8, linewidth=2, label='Trend')
+    ax4.legend()
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_rating(agg):
+    rating_counts = agg['rating_counts']
+    most_reviewed = agg['most_reviewed']
+    # Bubble grid instead of one point per book keeps the export size flat as the catalogue grows
+    price_rating = agg['price_rating']
+    grid = price_rating.groupby([(price_rating['retail_price'] // 2.5) * 2.5 + 1.25,
+                                 (price_rating['rating_value'] * 2).round() / 2])['rating_count'].agg(['sum', 'size'])
+    slope, intercept = agg['trend']
+    return [
+        panel('bar', f'Rating Distribution ({agg["rated"]} rated books out of {agg["total"]} total)',
+              [f'{r:g}' for r in rating_counts.index], rating_counts.values, colors=['#f39c12'],
+              text=share_text(rating_counts.values, agg['rated']), xlabel='Rating (Stars)', ylabel='Number of Books'),
+        panel('pie', 'Customer Review Engagement', ['Rated Books', 'Unrated Books'],
+              [agg['rated'], agg['total'] - agg['rated']], colors=['#2ecc71', '#e74c3c']),
+        panel('barh', 'Top 15 Most Reviewed Books (color: rating quality)', most_reviewed['short_name'],
+              most_reviewed['rating_count'], color_values=most_reviewed['rating_value'].values, color_range=[0, 5],
+              text=[f'{int(c)} (★{v:.1f})' for c, v in zip(most_reviewed['rating_count'], most_reviewed['rating_value'])],
+              xlabel='Number of Reviews'),
+        panel('scatter', 'Price vs Rating Correlation (bubble size = review count)',
+              [f'{size} books' for size in grid['size']], x=grid.index.get_level_values(0).values,
+              y=grid.index.get_level_values(1).values, size=(grid['sum'] * 3).values,
+              color_values=grid.index.get_level_values(1).values, color_range=[0, 5], ylim=[0, 5.5],
+              trend={'slope': slope, 'intercept': intercept,
+                     'x': [price_rating['retail_price'].min(), price_rating['retail_price'].max()]},
+              xlabel='Price (AZN)', ylabel='Rating (Stars)'),
+    ]
+
 
 # ===========================
 # 5. INSTALLMENT & PAYMENT OPTIONS
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('💳 Installment Plans & Payment Options Analysis', fontsize=18, fontweight='bold')
-
-# 5.1 Installment Availability
-ax1 = axes[0, 0]
-installment_data = df['installment_enabled'].value_counts()
-labels = ['Installment Available', 'No Installment']
-colors_inst = ['#27ae60', '#e74c3c']
-wedges, texts, autotexts = ax1.pie(installment_data.values, labels=labels,
-                                     autopct='%1.1f%%', colors=colors_inst, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax1.set_title('Installment Payment Availability')
-
-# 5.2 Installment Period Distribution
-ax2 = axes[0, 1]
-installment_books = df[df['installment_enabled'] == True]
-installment_months = installment_books['max_installment_months'].value_counts().sort_index()
-bars = ax2.bar(installment_months.index, installment_months.values, color='#3498db', edgecolor='black')
-ax2.set_xlabel('Maximum Installment Months')
-ax2.set_ylabel('Number of Books')
-ax2.set_title(f'Installment Period Distribution\n({len(installment_books)} books with installment)')
-for bar in bars:
-    height = bar.get_height()
-    ax2.text(bar.get_x() + bar.get_width()/2., height,
-            f'{int(height)}',
-            ha='center', va='bottom', fontweight='bold')
-
-# 5.3 Price Range by Installment Availability
-ax3 = axes[1, 0]
-inst_yes = df[df['installment_enabled'] == True]['retail_price'].dropna()
-inst_no = df[df['installment_enabled'] == False]['retail_price'].dropna()
-box_data = [inst_yes[inst_yes <= 100], inst_no[inst_no <= 100]]
-bp = ax3.boxplot(box_data, labels=['With Installment', 'Without Installment'],
-                 patch_artist=True, showmeans=True)
-for patch, color in zip(bp['boxes'], ['#27ae60', '#e74c3c']):
-    patch.set_facecolor(color)
-    patch.set_alpha(0.7)
-ax3.set_ylabel('Price (AZN)')
-ax3.set_title('Price Distribution by Installment Availability\n(books ≤100 AZN)')
-ax3.grid(True, alpha=0.3, axis='y')
-
-# Add statistics
-ax3.text(1, inst_yes[inst_yes <= 100].median(), f'Median: {inst_yes[inst_yes <= 100].median():.1f}',
-        ha='center', va='bottom', fontweight='bold', color='darkgreen')
-ax3.text(2, inst_no[inst_no <= 100].median(), f'Median: {inst_no[inst_no <= 100].median():.1f}',
-        ha='center', va='bottom', fontweight='bold', color='darkred')
-
-# 5.4 Installment Options by Category (Top 10)
-ax4 = axes[1, 1]
-cat_installment = df[df['installment_enabled'] == True].groupby('category_name').size().sort_values(ascending=False).head(10)
-bars = ax4.barh(range(len(cat_installment)), cat_installment.values, color='#9b59b6')
-ax4.set_yticks(range(len(cat_installment)))
-ax4.set_yticklabels(cat_installment.index, fontsize=9)
-ax4.set_xlabel('Books with Installment')
-ax4.set_title('Top 10 Categories with Installment Options')
-ax4.invert_yaxis()
-for i, v in enumerate(cat_installment.values):
-    total_in_cat = df[df['category_name'] == cat_installment.index[i]].shape[0]
-    percentage = (v/total_in_cat)*100
-    ax4.text(v, i, f' {v} ({percentage:.0f}%)', va='center', fontweight='bold', fontsize=8)
-
-plt.tight_layout()
-plt.savefig('charts/5_installment_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 5_installment_analysis.png")
-plt.close()
+def aggregate_installment(df):
+    installment_books = df[df['installment_enabled'] == True]
+    inst_yes = installment_books['retail_price'].dropna()
+    inst_no = df[df['installment_enabled'] == False]['retail_price'].dropna()
+    inst_yes = inst_yes[inst_yes <= 100]
+    inst_no = inst_no[inst_no <= 100]
+
+    cat_installment = installment_books.groupby('category_name').size().sort_values(ascending=False).head(10)
+    category_totals = df['category_name'].value_counts()
+    return {
+        'installment_data': installment_counts(df),
+        'installment_books': len(installment_books),
+        'installment_months': installment_books['max_installment_months'].value_counts().sort_index(),
+        # Box statistics instead of raw prices; drawn with Axes.bxp
+        'price_boxes': [box_stats(inst_yes, 'With Installment'), box_stats(inst_no, 'Without Installment')],
+        'price_medians': [inst_yes.median(), inst_no.median()],
+        'cat_installment': cat_installment,
+        'cat_totals': category_totals.reindex(cat_installment.index),
+    }
+
+
+def render_installment(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('💳 Installment Plans & Payment Options Analysis', fontsize=18, fontweight='bold')
+
+    # 5.1 Installment Availability
+    ax1 = axes[0, 0]
+    labels = ['Installment Available', 'No Installment']
+    colors_inst = ['#27ae60', '#e74c3c']
+    wedges, texts, autotexts = ax1.pie(agg['installment_data'].values, labels=labels,
+                                         autopct='%1.1f%%', colors=colors_inst, startangle=90)
+    style_pie_labels(autotexts)
+    ax1.set_title('Installment Payment Availability')
+
+    # 5.2 Installment Period Distribution
+    ax2 = axes[0, 1]
+    installment_months = agg['installment_months']
+    bars = ax2.bar(installment_months.index, installment_months.values, color='#3498db', edgecolor='black')
+    ax2.set_xlabel('Maximum Installment Months')
+    ax2.set_ylabel('Number of Books')
+    ax2.set_title(f'Installment Period Distribution\n({agg["installment_books"]} books with installment)')
+    for bar in bars:
+        height = bar.get_height()
+        ax2.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontweight='bold')
+
+    # 5.3 Price Range by Installment Availability
+    ax3 = axes[1, 0]
+    bp = ax3.bxp(agg['price_boxes'], patch_artist=True, showmeans=True)
+    for patch, color in zip(bp['boxes'], ['#27ae60', '#e74c3c']):
+        patch.set_facecolor(color)
+        patch.set_alpha(0.7)
+    ax3.set_ylabel('Price (AZN)')
+    ax3.set_title('Price Distribution by Installment Availability\n(books ≤100 AZN)')
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    # Add statistics
+    # A side with no books has a NaN median and gets no label
+    for position, median, color in zip([1, 2], agg['price_medians'], ['darkgreen', 'darkred']):
+        if not math.isnan(median):
+            ax3.text(position, median, f'Median: {median:.1f}',
+                    ha='center', va='bottom', fontweight='bold', color=color)
+
+    # 5.4 Installment Options by Category (Top 10)
+    ax4 = axes[1, 1]
+    cat_installment = agg['cat_installment']
+    ax4.barh(range(len(cat_installment)), cat_installment.values, color='#9b59b6')
+    ax4.set_yticks(range(len(cat_installment)))
+    ax4.set_yticklabels(cat_installment.index, fontsize=9)
+    ax4.set_xlabel('Books with Installment')
+    ax4.set_title('Top 10 Categories with Installment Options')
+    ax4.invert_yaxis()
+    for i, (v, total_in_cat) in enumerate(zip(cat_installment.values, agg['cat_totals'].values)):
+        percentage = (v/total_in_cat)*100
+        ax4.text(v, i, f' {v} ({percentage:.0f}%)', va='center', fontweight='bold', fontsize=8)
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_installment(agg):
+    installment_months = agg['installment_months']
+    cat_installment = agg['cat_installment']
+    boxes = [{key: box[key] for key in ('label', 'whislo', 'q1', 'med', 'q3', 'whishi', 'mean')}
+             for box in agg['price_boxes'] if not math.isnan(box['med'])]
+    return [
+        panel('pie', 'Installment Payment Availability', ['Installment Available', 'No Installment'],
+              agg['installment_data'].values, colors=['#27ae60', '#e74c3c']),
+        panel('bar', f'Installment Period Distribution ({agg["installment_books"]} books with installment)',
+              [f'{m:g}' for m in installment_months.index], installment_months.values, colors=['#3498db'],
+              text=[str(v) for v in installment_months.values],
+              xlabel='Maximum Installment Months', ylabel='Number of Books'),
+        panel('box', 'Price Distribution by Installment Availability (books ≤100 AZN)', boxes=boxes,
+              colors=['#27ae60', '#e74c3c'], ylabel='Price (AZN)'),
+        panel('barh', 'Top 10 Categories with Installment Options', cat_installment.index, cat_installment.values,
+              color='#9b59b6', text=[f'{v} ({v/total*100:.0f}%)' for v, total in zip(cat_installment.values, agg['cat_totals'].values)],
+              xlabel='Books with Installment'),
+    ]
+
 
 # ===========================
 # 6. BRAND ANALYSIS
 # ===========================
-fig, axes = plt.subplots(2, 2, figsize=(16, 12))
-fig.suptitle('🏷️ Brand Analysis & Market Presence', fontsize=18, fontweight='bold')
-
-# 6.1 Top 15 Brands
-ax1 = axes[0, 0]
-top_brands = df['brand'].value_counts().head(15)
-bars = ax1.barh(range(len(top_brands)), top_brands.values, color='#16a085')
-ax1.set_yticks(range(len(top_brands)))
-ax1.set_yticklabels(top_brands.index, fontsize=9)
-ax1.set_xlabel('Number of Books')
-ax1.set_title('Top 15 Brands by Book Count')
-ax1.invert_yaxis()
-for i, v in enumerate(top_brands.values):
-    ax1.text(v, i, f' {v} ({v/len(df)*100:.1f}%)', va='center', fontweight='bold', fontsize=8)
-
-# 6.2 Brand Diversity
-ax2 = axes[0, 1]
-total_brands = df['brand'].nunique()
-no_brand = (df['brand'] == 'No Brand').sum()
-branded = len(df) - no_brand
-brand_data = {
-    'Branded Books': branded,
-    'No Brand': no_brand
-}
-colors_brand = ['#2ecc71', '#95a5a6']
-wedges, texts, autotexts = ax2.pie(brand_data.values(), labels=brand_data.keys(),
-                                     autopct='%1.1f%%', colors=colors_brand, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-ax2.set_title(f'Brand Presence\nTotal Unique Brands: {total_brands}')
-
-# 6.3 Average Price by Top Brands
-ax3 = axes[1, 0]
-brand_avg_price = df.groupby('brand').agg({
-    'retail_price': 'mean',
-    'name': 'count'
-}).rename(columns={'name': 'count'})
-brand_avg_price = brand_avg_price[brand_avg_price['count'] >= 15].sort_values('retail_price', ascending=False).head(10)
-bars = ax3.barh(range(len(brand_avg_price)), brand_avg_price['retail_price'], color='#e67e22')
-ax3.set_yticks(range(len(brand_avg_price)))
-ax3.set_yticklabels(brand_avg_price.index, fontsize=9)
-ax3.set_xlabel('Average Price (AZN)')
-ax3.set_title('Top 10 Brands by Average Price\n(min 15 books)')
-ax3.invert_yaxis()
-for i, v in enumerate(brand_avg_price['retail_price']):
-    ax3.text(v, i, f' {v:.1f} AZN', va='center', fontweight='bold')
-
-# 6.4 Brand Rating Performance
-ax4 = axes[1, 1]
-brand_ratings = df[df['rating_value'] > 0].groupby('brand').agg({
-    'rating_value': 'mean',
-    'rating_count': 'sum',
-    'name': 'count'
-}).rename(columns={'name': 'book_count'})
-brand_ratings = brand_ratings[brand_ratings['book_count'] >= 10].sort_values('rating_value', ascending=False).head(12)
-bars = ax4.barh(range(len(brand_ratings)), brand_ratings['rating_value'], color='#f39c12')
-ax4.set_yticks(range(len(brand_ratings)))
-ax4.set_yticklabels(brand_ratings.index, fontsize=8)
-ax4.set_xlabel('Average Rating')
-ax4.set_title('Top 12 Brands by Average Rating\n(min 10 books)')
-ax4.invert_yaxis()
-ax4.set_xlim(0, 5.5)
-for i, v in enumerate(brand_ratings['rating_value']):
-    ax4.text(v, i, f' ★{v:.2f}', va='center', fontweight='bold')
-
-plt.tight_layout()
-plt.savefig('charts/6_brand_analysis.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 6_brand_analysis.png")
-plt.close()
+def aggregate_brand(df):
+    no_brand = (df['brand'] == 'No Brand').sum()
+    brand_avg_price = df.groupby('brand').agg({
+        'retail_price': 'mean',
+        'name': 'count'
+    }).rename(columns={'name': 'count'})
+    brand_avg_price = brand_avg_price[brand_avg_price['count'] >= 15].sort_values('retail_price', ascending=False).head(10)
+    brand_ratings = df[df['rating_value'] > 0].groupby('brand').agg({
+        'rating_value': 'mean',
+        'rating_count': 'sum',
+        'name': 'count'
+    }).rename(columns={'name': 'book_count'})
+    brand_ratings = brand_ratings[brand_ratings['book_count'] >= 10].sort_values('rating_value', ascending=False).head(12)
+    return {
+        'total': len(df),
+        'top_brands': df['brand'].value_counts().head(15),
+        'total_brands': df['brand'].nunique(),
+        'brand_data': {
+            'Branded Books': len(df) - no_brand,
+            'No Brand': no_brand
+        },
+        'brand_avg_price': brand_avg_price['retail_price'],
+        'brand_ratings': brand_ratings['rating_value'],
+    }
+
+
+def render_brand(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 2, figsize=(16, 12))
+    fig.suptitle('🏷️ Brand Analysis & Market Presence', fontsize=18, fontweight='bold')
+
+    # 6.1 Top 15 Brands
+    ax1 = axes[0, 0]
+    top_brands = agg['top_brands']
+    ax1.barh(range(len(top_brands)), top_brands.values, color='#16a085')
+    ax1.set_yticks(range(len(top_brands)))
+    ax1.set_yticklabels(top_brands.index, fontsize=9)
+    ax1.set_xlabel('Number of Books')
+    ax1.set_title('Top 15 Brands by Book Count')
+    ax1.invert_yaxis()
+    for i, v in enumerate(top_brands.values):
+        ax1.text(v, i, f' {v} ({v/agg["total"]*100:.1f}%)', va='center', fontweight='bold', fontsize=8)
+
+    # 6.2 Brand Diversity
+    ax2 = axes[0, 1]
+    brand_data = agg['brand_data']
+    colors_brand = ['#2ecc71', '#95a5a6']
+    wedges, texts, autotexts = ax2.pie(brand_data.values(), labels=brand_data.keys(),
+                                         autopct='%1.1f%%', colors=colors_brand, startangle=90)
+    style_pie_labels(autotexts)
+    ax2.set_title(f'Brand Presence\nTotal Unique Brands: {agg["total_brands"]}')
+
+    # 6.3 Average Price by Top Brands
+    ax3 = axes[1, 0]
+    brand_avg_price = agg['brand_avg_price']
+    ax3.barh(range(len(brand_avg_price)), brand_avg_price.values, color='#e67e22')
+    ax3.set_yticks(range(len(brand_avg_price)))
+    ax3.set_yticklabels(brand_avg_price.index, fontsize=9)
+    ax3.set_xlabel('Average Price (AZN)')
+    ax3.set_title('Top 10 Brands by Average Price\n(min 15 books)')
+    ax3.invert_yaxis()
+    for i, v in enumerate(brand_avg_price.values):
+        ax3.text(v, i, f' {v:.1f} AZN', va='center', fontweight='bold')
+
+    # 6.4 Brand Rating Performance
+    ax4 = axes[1, 1]
+    brand_ratings = agg['brand_ratings']
+    ax4.barh(range(len(brand_ratings)), brand_ratings.values, color='#f39c12')
+    ax4.set_yticks(range(len(brand_ratings)))
+    ax4.set_yticklabels(brand_ratings.index, fontsize=8)
+    ax4.set_xlabel('Average Rating')
+    ax4.set_title('Top 12 Brands by Average Rating\n(min 10 books)')
+    ax4.invert_yaxis()
+    ax4.set_xlim(0, 5.5)
+    for i, v in enumerate(brand_ratings.values):
+        ax4.text(v, i, f' ★{v:.2f}', va='center', fontweight='bold')
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_brand(agg):
+    top_brands = agg['top_brands']
+    brand_avg_price = agg['brand_avg_price']
+    brand_ratings = agg['brand_ratings']
+    return [
+        panel('barh', 'Top 15 Brands by Book Count', top_brands.index, top_brands.values,
+              color='#16a085', text=share_text(top_brands.values, agg['total']), xlabel='Number of Books'),
+        panel('pie', f'Brand Presence (Total Unique Brands: {agg["total_brands"]})',
+              agg['brand_data'].keys(), agg['brand_data'].values(), colors=['#2ecc71', '#95a5a6']),
+        panel('barh', 'Top 10 Brands by Average Price (min 15 books)', brand_avg_price.index, brand_avg_price.values,
+              color='#e67e22', text=[f'{v:.1f} AZN' for v in brand_avg_price.values], xlabel='Average Price (AZN)'),
+        panel('barh', 'Top 12 Brands by Average Rating (min 10 books)', brand_ratings.index, brand_ratings.values,
+              color='#f39c12', text=[f'★{v:.2f}' for v in brand_ratings.values], xlim=[0, 5.5],
+              xlabel='Average Rating'),
+    ]
+
 
 # ===========================
 # 7. MARKET OVERVIEW DASHBOARD (SIMPLIFIED)
 # ===========================
-fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-fig.suptitle('📊 Market Overview Dashboard', fontsize=20, fontweight='bold', y=0.995)
-
-# 1. Top Categories
-ax1 = axes[0, 0]
-top_5_cats = df['category_name'].value_counts().head(5)
-bars = ax1.barh(range(len(top_5_cats)), top_5_cats.values, color='#3498db')
-ax1.set_yticks(range(len(top_5_cats)))
-ax1.set_yticklabels([name[:25] for name in top_5_cats.index], fontsize=10)
-ax1.set_xlabel('Books', fontsize=11)
-ax1.set_title('Top 5 Categories', fontsize=13, fontweight='bold', pad=10)
-ax1.invert_yaxis()
-for i, v in enumerate(top_5_cats.values):
-    ax1.text(v + 20, i, f'{v}', va='center', fontsize=9)
-
-# 2. Top Sellers
-ax2 = axes[0, 1]
-top_5_sellers = df['seller_name'].value_counts().head(5)
-bars = ax2.barh(range(len(top_5_sellers)), top_5_sellers.values, color='#e67e22')
-ax2.set_yticks(range(len(top_5_sellers)))
-ax2.set_yticklabels([name[:20] for name in top_5_sellers.index], fontsize=10)
-ax2.set_xlabel('Books', fontsize=11)
-ax2.set_title('Top 5 Sellers', fontsize=13, fontweight='bold', pad=10)
-ax2.invert_yaxis()
-for i, v in enumerate(top_5_sellers.values):
-    ax2.text(v + 50, i, f'{v}', va='center', fontsize=9)
-
-# 3. Price Distribution
-ax3 = axes[0, 2]
-prices_viz = df['retail_price'][df['retail_price'] <= 50]
-ax3.hist(prices_viz, bins=40, color='#2ecc71', alpha=0.7, edgecolor='black', linewidth=0.5)
-ax3.axvline(prices_viz.median(), color='red', linestyle='--', linewidth=2, label=f'Median: {prices_viz.median():.1f}')
-ax3.set_xlabel('Price (AZN)', fontsize=11)
-ax3.set_ylabel('Count', fontsize=11)
-ax3.set_title('Price Distribution (≤50 AZN)', fontsize=13, fontweight='bold', pad=10)
-ax3.legend(fontsize=10)
-ax3.grid(True, alpha=0.3, axis='y')
-
-# 4. Rating Distribution
-ax4 = axes[1, 0]
-rating_counts = rated_books['rating_value'].value_counts().sort_index()
-bars = ax4.bar(rating_counts.index, rating_counts.values, color='#f39c12', edgecolor='black', linewidth=1)
-ax4.set_xlabel('Rating (Stars)', fontsize=11)
-ax4.set_ylabel('Count', fontsize=11)
-ax4.set_title('Customer Ratings', fontsize=13, fontweight='bold', pad=10)
-ax4.set_xticks([1, 2, 3, 4, 5])
-ax4.grid(True, alpha=0.3, axis='y')
-for bar in bars:
-    height = bar.get_height()
-    ax4.text(bar.get_x() + bar.get_width()/2., height,
-            f'{int(height)}',
-            ha='center', va='bottom', fontsize=9)
-
-# 5. Price Segments
-ax5 = axes[1, 1]
-colors_seg = ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']
-wedges, texts, autotexts = ax5.pie(segment_counts.values, labels=segment_counts.index,
-                                     autopct='%1.1f%%', colors=colors_seg, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-    autotext.set_fontsize(10)
-for text in texts:
-    text.set_fontsize(9)
-ax5.set_title('Market Segments', fontsize=13, fontweight='bold', pad=10)
-
-# 6. Installment vs No Installment
-ax6 = axes[1, 2]
-inst_counts = df['installment_enabled'].value_counts()
-colors_inst = ['#27ae60', '#e74c3c']
-labels_inst = [f'Installment\n({inst_counts[True]} books)', f'Cash Only\n({inst_counts[False]} books)']
-wedges, texts, autotexts = ax6.pie(inst_counts.values, labels=labels_inst,
-                                     autopct='%1.1f%%', colors=colors_inst, startangle=90)
-for autotext in autotexts:
-    autotext.set_color('white')
-    autotext.set_fontweight('bold')
-    autotext.set_fontsize(11)
-for text in texts:
-    text.set_fontsize(10)
-ax6.set_title('Payment Options', fontsize=13, fontweight='bold', pad=10)
-
-plt.tight_layout()
-plt.savefig('charts/7_market_overview.png', dpi=300, bbox_inches='tight')
-print("✓ Saved: 7_market_overview.png")
-plt.close()
-
-print("\n" + "="*60)
-print("✅ All charts generated successfully!")
-print("="*60)
-print(f"Charts saved to: ./charts/")
-print(f"Total charts: 7")
+def aggregate_overview(df):
+    prices_viz = df['retail_price'][df['retail_price'] <= 50]
+    rated_books = df[df['rating_value'] > 0]
+    return {
+        'top_5_cats': df['category_name'].value_counts().head(5),
+        'top_5_sellers': df['seller_name'].value_counts().head(5),
+        'price_hist': histogram(prices_viz, bins=40),
+        'price_median': prices_viz.median(),
+        'rating_counts': rated_books['rating_value'].value_counts().sort_index(),
+        'segment_counts': price_segment_counts(df),
+        'inst_counts': installment_counts(df),
+    }
+
+
+def render_overview(agg):
+    plt = pyplot()
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+    fig.suptitle('📊 Market Overview Dashboard', fontsize=20, fontweight='bold', y=0.995)
+
+    # 1. Top Categories
+    ax1 = axes[0, 0]
+    top_5_cats = agg['top_5_cats']
+    ax1.barh(range(len(top_5_cats)), top_5_cats.values, color='#3498db')
+    ax1.set_yticks(range(len(top_5_cats)))
+    ax1.set_yticklabels([name[:25] for name in top_5_cats.index], fontsize=10)
+    ax1.set_xlabel('Books', fontsize=11)
+    ax1.set_title('Top 5 Categories', fontsize=13, fontweight='bold', pad=10)
+    ax1.invert_yaxis()
+    for i, v in enumerate(top_5_cats.values):
+        ax1.text(v + 20, i, f'{v}', va='center', fontsize=9)
+
+    # 2. Top Sellers
+    ax2 = axes[0, 1]
+    top_5_sellers = agg['top_5_sellers']
+    ax2.barh(range(len(top_5_sellers)), top_5_sellers.values, color='#e67e22')
+    ax2.set_yticks(range(len(top_5_sellers)))
+    ax2.set_yticklabels([name[:20] for name in top_5_sellers.index], fontsize=10)
+    ax2.set_xlabel('Books', fontsize=11)
+    ax2.set_title('Top 5 Sellers', fontsize=13, fontweight='bold', pad=10)
+    ax2.invert_yaxis()
+    for i, v in enumerate(top_5_sellers.values):
+        ax2.text(v + 50, i, f'{v}', va='center', fontsize=9)
+
+    # 3. Price Distribution
+    ax3 = axes[0, 2]
+    draw_histogram(ax3, agg['price_hist'], color='#2ecc71', alpha=0.7, edgecolor='black', linewidth=0.5)
+    ax3.axvline(agg['price_median'], color='red', linestyle='--', linewidth=2, label=f'Median: {agg["price_median"]:.1f}')
+    ax3.set_xlabel('Price (AZN)', fontsize=11)
+    ax3.set_ylabel('Count', fontsize=11)
+    ax3.set_title('Price Distribution (≤50 AZN)', fontsize=13, fontweight='bold', pad=10)
+    ax3.legend(fontsize=10)
+    ax3.grid(True, alpha=0.3, axis='y')
+
+    # 4. Rating Distribution
+    ax4 = axes[1, 0]
+    rating_counts = agg['rating_counts']
+    bars = ax4.bar(rating_counts.index, rating_counts.values, color='#f39c12', edgecolor='black', linewidth=1)
+    ax4.set_xlabel('Rating (Stars)', fontsize=11)
+    ax4.set_ylabel('Count', fontsize=11)
+    ax4.set_title('Customer Ratings', fontsize=13, fontweight='bold', pad=10)
+    ax4.set_xticks([1, 2, 3, 4, 5])
+    ax4.grid(True, alpha=0.3, axis='y')
+    for bar in bars:
+        height = bar.get_height()
+        ax4.text(bar.get_x() + bar.get_width()/2., height,
+                f'{int(height)}',
+                ha='center', va='bottom', fontsize=9)
+
+    # 5. Price Segments
+    ax5 = axes[1, 1]
+    segment_counts = agg['segment_counts']
+    colors_seg = ['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']
+    wedges, texts, autotexts = ax5.pie(segment_counts.values, labels=segment_counts.index,
+                                         autopct='%1.1f%%', colors=colors_seg, startangle=90)
+    style_pie_labels(autotexts)
+    for autotext in autotexts:
+        autotext.set_fontsize(10)
+    for text in texts:
+        text.set_fontsize(9)
+    ax5.set_title('Market Segments', fontsize=13, fontweight='bold', pad=10)
+
+    # 6. Installment vs No Installment
+    ax6 = axes[1, 2]
+    inst_counts = agg['inst_counts']
+    colors_inst = ['#27ae60', '#e74c3c']
+    labels_inst = [f'Installment\n({inst_counts[True]} books)', f'Cash Only\n({inst_counts[False]} books)']
+    wedges, texts, autotexts = ax6.pie(inst_counts.values, labels=labels_inst,
+                                         autopct='%1.1f%%', colors=colors_inst, startangle=90)
+    style_pie_labels(autotexts)
+    for autotext in autotexts:
+        autotext.set_fontsize(11)
+    for text in texts:
+        text.set_fontsize(10)
+    ax6.set_title('Payment Options', fontsize=13, fontweight='bold', pad=10)
+
+    plt.tight_layout()
+    return fig
+
+
+def panels_overview(agg):
+    top_5_cats = agg['top_5_cats']
+    top_5_sellers = agg['top_5_sellers']
+    rating_counts = agg['rating_counts']
+    segment_counts = agg['segment_counts']
+    inst_counts = agg['inst_counts']
+    return [
+        panel('barh', 'Top 5 Categories', [name[:25] for name in top_5_cats.index], top_5_cats.values,
+              color='#3498db', xlabel='Books'),
+        panel('barh', 'Top 5 Sellers', [name[:20] for name in top_5_sellers.index], top_5_sellers.values,
+              color='#e67e22', xlabel='Books'),
+        hist_panel('Price Distribution (≤50 AZN)', agg['price_hist'], '#2ecc71',
+                   lines=[{'x': agg['price_median'], 'color': 'red', 'label': f'Median: {agg["price_median"]:.1f}'}],
+                   xlabel='Price (AZN)', ylabel='Count'),
+        panel('bar', 'Customer Ratings', [f'{r:g}' for r in rating_counts.index], rating_counts.values,
+              colors=['#f39c12'], xlabel='Rating (Stars)', ylabel='Count'),
+        panel('pie', 'Market Segments', segment_counts.index, segment_counts.values,
+              colors=['#3498db', '#2ecc71', '#f39c12', '#e74c3c', '#9b59b6']),
+        panel('pie', 'Payment Options', [f'Installment ({inst_counts[True]} books)', f'Cash Only ({inst_counts[False]} books)'],
+              inst_counts.values, colors=['#27ae60', '#e74c3c']),
+    ]
+
+
+# Chart name -> (aggregation, PNG renderer, dashboard panels); each stage can be run and timed on its own
+CHARTS = {
+    '1_pricing_strategy': (aggregate_pricing, render_pricing, panels_pricing),
+    '2_category_analysis': (aggregate_category, render_category, panels_category),
+    '3_seller_analysis': (aggregate_seller, render_seller, panels_seller),
+    '4_rating_analysis': (aggregate_rating, render_rating, panels_rating),
+    '5_installment_analysis': (aggregate_installment, render_installment, panels_installment),
+    '6_brand_analysis': (aggregate_brand, render_brand, panels_brand),
+    '7_market_overview': (aggregate_overview, render_overview, panels_overview),
+}
+
+
+def save_chart(fig, path, dpi=300):
+    fig.savefig(path, dpi=dpi, bbox_inches='tight')
+    pyplot().close(fig)
+
+
+# ===========================
+# DASHBOARD EXPORT
+# ===========================
+def to_json_safe(value):
+    """Convert numpy/pandas values to plain JSON types, rounding floats to keep the file small"""
+    import numpy as np
+    import pandas as pd
+    if isinstance(value, dict):
+        return {str(k): to_json_safe(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple, np.ndarray, pd.Series, pd.Index)):
+        return [to_json_safe(v) for v in list(value)]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float):
+        return None if np.isnan(value) else round(value, 4)
+    return value
+
+
+def export_dashboard(path, chart_panels, records, source=DATA_FILE):
+    """Write chart name -> panel specs as the data file for charts/dashboard.html"""
+    data = {
+        'source': os.path.basename(source),
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'records': records,
+        'charts': [{
+            'name': chart_name,
+            'title': chart_name.split('_', 1)[1].replace('_', ' ').title(),
+            'panels': panels,
+        } for chart_name, panels in chart_panels.items()],
+    }
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(to_json_safe(data), f, ensure_ascii=False, separators=(',', ':'))
+
+
+def copy_dashboard_page(output_dir):
+    """Put dashboard.html next to the exported JSON, which it loads by relative path"""
+    page_path = os.path.join(output_dir, os.path.basename(DASHBOARD_PAGE))
+    if not (os.path.exists(page_path) and os.path.samefile(page_path, DASHBOARD_PAGE)):
+        shutil.copyfile(DASHBOARD_PAGE, page_path)
+    return page_path
+
+
+def select_charts(requested):
+    """Resolve chart names or their number prefixes ('1', '7_market_overview') to CHARTS keys"""
+    if not requested:
+        return list(CHARTS)
+    selected = []
+    for item in requested:
+        matches = [name for name in CHARTS if name == item or name.split('_', 1)[0] == item]
+        if not matches:
+            raise ValueError(f"Unknown chart '{item}'. Available: {', '.join(CHARTS)}")
+        selected.extend(name for name in matches if name not in selected)
+    return selected
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Generate business insight charts from a scraped books CSV')
+    parser.add_argument('--data', default=DATA_FILE, help=f'Input CSV (default: {DATA_FILE})')
+    parser.add_argument('--output-dir', default=CHARTS_DIR, help=f'Where to write charts (default: {CHARTS_DIR}/)')
+    parser.add_argument('--format', choices=['png', 'json', 'both'], default='png',
+                        help='png: 300-dpi figures for print; json: aggregates for dashboard.html; both')
+    parser.add_argument('--charts', nargs='+', metavar='CHART',
+                        help='Only these charts, by name or number (e.g. 1 7_market_overview); default: all')
+    parser.add_argument('--dpi', type=int, default=300, help='PNG resolution (default: 300)')
+    parser.add_argument('--check', action='store_true', help='Only validate the input and print the report, then exit')
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if the input has schema violations')
+    args = parser.parse_args(argv)
+
+    try:
+        chart_names = select_charts(args.charts)
+    except ValueError as e:
+        parser.error(str(e))
+
+    # Fail fast on a wrong file before paying for the pandas import
+    missing = missing_columns(args.data)
+    if missing:
+        print(f"❌ {args.data} is missing columns: {', '.join(missing)}")
+        return 1
+
+    from validate_books import validate, format_report
+    df = load_data(args.data)
+    violations = validate(df)
+    print(format_report(violations, len(df), source=args.data))
+    if violations and args.strict:
+        return 1
+    if args.check:
+        return 0
+
+    df = coerce_types(df)
+
+    print("Generating business insights charts...")
+    print(f"Total records: {len(df)}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    chart_panels = {}
+    for chart_name in chart_names:
+        aggregate, render, panels = CHARTS[chart_name]
+        agg = aggregate(df)
+        if args.format in ('json', 'both'):
+            chart_panels[chart_name] = panels(agg)
+        if args.format in ('png', 'both'):
+            save_chart(render(agg), os.path.join(args.output_dir, f'{chart_name}.png'), dpi=args.dpi)
+            print(f"✓ Saved: {chart_name}.png")
+
+    if chart_panels:
+        json_path = os.path.join(args.output_dir, DASHBOARD_DATA_FILE)
+        export_dashboard(json_path, chart_panels, len(df), source=args.data)
+        print(f"✓ Saved: {DASHBOARD_DATA_FILE} ({os.path.getsize(json_path) / 1024:.1f} KB)")
+        page_path = copy_dashboard_page(args.output_dir)
+
+    print("\n" + "="*60)
+    print("✅ All charts generated successfully!")
+    print("="*60)
+    print(f"Charts saved to: {os.path.join(args.output_dir, '')}")
+    if chart_panels:
+        print(f"Dashboard: open {page_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
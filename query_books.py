@@ -0,0 +1,507 @@
+import argparse
+import bisect
+import csv
+import json
+import os
+import re
+import time
+import unicodedata
+from itertools import chain
+from typing import Dict, Iterable, Iterator, List, Optional, Set
+
+DEFAULT_INDEX = "books_index.json"
+INDEX_VERSION = 2
+
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+# Index file sections, in file order, between the header line and the posting lists
+POSTING_SECTIONS = ["name_tokens", "brand_tokens", "categories", "sellers", "installment"]
+SECTIONS = POSTING_SECTIONS + ["discounted", "prices", "name_order", "offsets"]
+
+
+class _CombiningMarks(dict):
+    """str.translate table that deletes combining characters, filled in as code points are seen"""
+
+    def __missing__(self, codepoint: int) -> Optional[int]:
+        self[codepoint] = None if unicodedata.combining(chr(codepoint)) else codepoint
+        return self[codepoint]
+
+
+STRIP_COMBINING = _CombiningMarks()
+
+
+def normalize(text: str) -> str:
+    """Casefold and strip diacritics so 'Nağıllar' matches 'nagillar'"""
+    return unicodedata.normalize("NFKD", text.casefold()).translate(STRIP_COMBINING)
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """Split text into normalized word tokens"""
+    if not text:
+        return set()
+    return set(TOKEN_RE.findall(normalize(text)))
+
+
+def to_float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_bool(value) -> Optional[bool]:
+    if isinstance(value, bool):
+        return value
+    if value in ("True", "true", "1"):
+        return True
+    if value in ("False", "false", "0"):
+        return False
+    return None
+
+
+def to_text(value) -> str:
+    return value or ""
+
+
+# Columns kept per record and how each is parsed; everything else stays in the CSV snapshot
+RECORD_FIELDS = {
+    "name": to_text,
+    "brand": to_text,
+    "category_name": to_text,
+    "seller_name": to_text,
+    "retail_price": to_float,
+    "old_price": to_float,
+    "installment_enabled": to_bool,
+}
+
+
+class BookIndex:
+    """Persistent inverted/sorted indexes over scraped book snapshots.
+
+    The index file is line-oriented JSON: a header, one line per section (a
+    key -> position directory for each posting family, the sorted price list,
+    the name order and the record offsets), one line per posting list and one
+    line per record. A read-only query parses only the sections it touches and
+    seeks to the posting lists and records it needs; ingesting loads everything
+    so a new snapshot can be applied as a diff against the stored records.
+    """
+
+    def __init__(self):
+        self.records: Dict[str, Dict] = {}
+        self.snapshots: List[Dict] = []
+        self.name_tokens: Dict[str, Set[str]] = {}
+        self.brand_tokens: Dict[str, Set[str]] = {}
+        self.categories: Dict[str, Set[str]] = {}
+        self.sellers: Dict[str, Set[str]] = {}
+        self.installment: Dict[str, Set[str]] = {"True": set(), "False": set()}
+        self.discounted: Set[str] = set()
+        self.prices: List[List] = []  # sorted [price, id] pairs
+        self.name_order: List[str] = []  # ids sorted by normalized name
+        # Set by load(records=False): everything stays on disk until a query reads it
+        self.path: Optional[str] = None
+        self.offsets: Dict[str, List[int]] = {}
+        self._unread: Dict[str, List[int]] = {}
+        self._postings_start = 0
+        self._records_start = 0
+
+    @property
+    def lazy(self) -> bool:
+        return self.path is not None
+
+    # ---------------------------
+    # Persistence
+    # ---------------------------
+    @classmethod
+    def load(cls, path: str = DEFAULT_INDEX, records: bool = True) -> "BookIndex":
+        """Load an index; with records=False only the header is parsed and the index is read-only"""
+        index = cls()
+        if not os.path.exists(path):
+            return index
+
+        with open(path, "rb") as f:
+            header = json.loads(f.readline())
+            if header.get("version") != INDEX_VERSION:
+                raise ValueError(f"Unsupported index version in {path}: {header.get('version')} "
+                                 f"(delete it and re-run 'index')")
+            index.snapshots = header["snapshots"]
+
+            header_size = f.tell()
+            if not records:
+                index.path = path
+                index._unread = {name: [header_size + start, length]
+                                 for name, (start, length) in header["sections"].items()}
+                index._postings_start = header_size + header["postings"]
+                index._records_start = header_size + header["records"]
+                return index
+
+            for name in SECTIONS:
+                setattr(index, name, json.loads(f.readline()))
+            # Posting lists follow the sections in directory order
+            for name in POSTING_SECTIONS:
+                setattr(index, name, {key: set(json.loads(f.readline())) for key in getattr(index, name)})
+            for line in f:
+                record = json.loads(line)
+                index.records[record.pop("id")] = record
+
+        index.discounted = set(index.discounted)
+        index.offsets = {}
+        return index
+
+    def save(self, path: str = DEFAULT_INDEX):
+        if self.lazy:
+            raise ValueError("Index was loaded without records and is read-only")
+
+        # Positions in a directory are relative to the start of its area
+        sections = {}
+        posting_lines = []
+        position = 0
+        for name in POSTING_SECTIONS:
+            directory = {}
+            for key, ids in getattr(self, name).items():
+                line = _json_line(sorted(ids))
+                directory[key] = [position, len(line)]
+                position += len(line)
+                posting_lines.append(line)
+            sections[name] = directory
+
+        record_lines = []
+        offsets = {}
+        position = 0
+        for product_id, record in self.records.items():
+            line = _json_line(dict(record, id=product_id))
+            offsets[product_id] = [position, len(line)]
+            position += len(line)
+            record_lines.append(line)
+
+        sections.update(discounted=sorted(self.discounted), prices=self.prices,
+                        name_order=self.name_order, offsets=offsets)
+        section_lines = [_json_line(sections[name]) for name in SECTIONS]
+
+        # Header positions are relative to the end of the header line
+        directory = {}
+        position = 0
+        for name, line in zip(SECTIONS, section_lines):
+            directory[name] = [position, len(line)]
+            position += len(line)
+        header = {
+            "version": INDEX_VERSION,
+            "snapshots": self.snapshots,
+            "sections": directory,
+            "postings": position,
+            "records": position + sum(len(line) for line in posting_lines),
+        }
+
+        # Write to a temp file first so an interrupted save never corrupts the index
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_json_line(header))
+            f.writelines(section_lines)
+            f.writelines(posting_lines)
+            f.writelines(record_lines)
+        os.replace(tmp_path, path)
+
+    def _read(self, start: int, length: int):
+        with open(self.path, "rb") as f:
+            f.seek(start)
+            return json.loads(f.read(length))
+
+    def _section(self, name: str):
+        """Parse a section of a read-only index the first time a query uses it"""
+        if name in self._unread:
+            setattr(self, name, self._read(*self._unread.pop(name)))
+        return getattr(self, name)
+
+    # ---------------------------
+    # Incremental maintenance
+    # ---------------------------
+    @staticmethod
+    def _post(postings: Dict[str, Set[str]], keys: Iterable[str], product_id: str):
+        for key in keys:
+            postings.setdefault(key, set()).add(product_id)
+
+    @staticmethod
+    def _unpost(postings: Dict[str, Set[str]], keys: Iterable[str], product_id: str):
+        for key in keys:
+            ids = postings.get(key)
+            if ids is None:
+                continue
+            ids.discard(product_id)
+            if not ids:
+                del postings[key]
+
+    def _add(self, product_id: str, record: Dict, new_prices: List[List]):
+        self.records[product_id] = record
+        self._post(self.name_tokens, tokenize(record["name"]), product_id)
+        self._post(self.brand_tokens, tokenize(record["brand"]), product_id)
+        if record["category_name"]:
+            self._post(self.categories, [normalize(record["category_name"])], product_id)
+        if record["seller_name"]:
+            self._post(self.sellers, [normalize(record["seller_name"])], product_id)
+        if record["installment_enabled"] is not None:
+            self.installment[str(record["installment_enabled"])].add(product_id)
+        if is_discounted(record):
+            self.discounted.add(product_id)
+        if record["retail_price"] is not None:
+            new_prices.append([record["retail_price"], product_id])
+
+    def _remove(self, product_id: str):
+        record = self.records.pop(product_id)
+        self._unpost(self.name_tokens, tokenize(record["name"]), product_id)
+        self._unpost(self.brand_tokens, tokenize(record["brand"]), product_id)
+        if record["category_name"]:
+            self._unpost(self.categories, [normalize(record["category_name"])], product_id)
+        if record["seller_name"]:
+            self._unpost(self.sellers, [normalize(record["seller_name"])], product_id)
+        for ids in self.installment.values():
+            ids.discard(product_id)
+        self.discounted.discard(product_id)
+        if record["retail_price"] is not None:
+            pos = bisect.bisect_left(self.prices, [record["retail_price"], product_id])
+            if pos < len(self.prices) and self.prices[pos] == [record["retail_price"], product_id]:
+                del self.prices[pos]
+
+    def ingest(self, csv_path: str) -> Dict[str, int]:
+        """Apply a full catalogue snapshot as a diff against the current records"""
+        if self.lazy:
+            raise ValueError("Index was loaded without records and is read-only")
+
+        fresh = {}
+        with open(csv_path, "r", newline="", encoding="utf-8-sig") as csvfile:
+            for row in csv.DictReader(csvfile):
+                product_id = row.get("id")
+                if product_id:
+                    fresh[product_id] = record_from_row(row)
+
+        stats = {"added": 0, "updated": 0, "removed": 0, "unchanged": 0}
+
+        for product_id in [pid for pid in self.records if pid not in fresh]:
+            self._remove(product_id)
+            stats["removed"] += 1
+
+        new_prices = []
+        for product_id, record in fresh.items():
+            current = self.records.get(product_id)
+            if current == record:
+                stats["unchanged"] += 1
+                continue
+            if current is not None:
+                self._remove(product_id)
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            self._add(product_id, record, new_prices)
+
+        if len(new_prices) <= 64:
+            for pair in new_prices:
+                bisect.insort(self.prices, pair)
+        else:
+            # One sort instead of an O(n) insort per product; timsort merges the
+            # appended run into the already-sorted list
+            self.prices.extend(new_prices)
+            self.prices.sort()
+        if stats["added"] or stats["updated"] or stats["removed"]:
+            self.name_order = sorted(self.records, key=lambda pid: (normalize(self.records[pid]["name"]), pid))
+
+        stat = os.stat(csv_path)
+        self.snapshots.append({
+            "file": os.path.basename(csv_path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime,
+            "rows": len(fresh),
+        })
+        return stats
+
+    def has_snapshot(self, csv_path: str) -> bool:
+        stat = os.stat(csv_path)
+        name = os.path.basename(csv_path)
+        return any(s["file"] == name and s["size"] == stat.st_size and s["mtime"] == stat.st_mtime
+                   for s in self.snapshots)
+
+    # ---------------------------
+    # Queries
+    # ---------------------------
+    def _postings(self, section: str, key: str) -> Set[str]:
+        postings = self._section(section)
+        ids = postings.get(key)
+        if ids is None:
+            return set()
+        if isinstance(ids, list):
+            # A read-only index holds [position, length] until the posting list is needed
+            position, length = ids
+            ids = postings[key] = set(self._read(self._postings_start + position, length))
+        return ids
+
+    def search(self, text: str = None, brand: str = None, category: str = None, seller: str = None,
+               min_price: float = None, max_price: float = None, installment: bool = None,
+               discounted: bool = False, sort: str = "price", limit: int = 20) -> List[Dict]:
+        """Intersect posting lists, smallest first, then walk the price or name order up to limit"""
+        candidates: List[Set[str]] = []
+
+        for token in tokenize(text):
+            # A text token may appear in either the title or the brand
+            candidates.append(self._postings("name_tokens", token) | self._postings("brand_tokens", token))
+        for token in tokenize(brand):
+            candidates.append(self._postings("brand_tokens", token))
+        if category:
+            candidates.append(self._postings("categories", normalize(category)))
+        if seller:
+            candidates.append(self._postings("sellers", normalize(seller)))
+        if installment is not None:
+            candidates.append(self._postings("installment", str(installment)))
+        if discounted:
+            candidates.append(set(self._section("discounted")))
+
+        ids: Optional[Set[str]] = None  # None means every product
+        if candidates:
+            candidates.sort(key=len)
+            ids = set(candidates[0])
+            for postings in candidates[1:]:
+                if not ids:
+                    break
+                ids &= postings
+
+        price_filtered = min_price is not None or max_price is not None
+        if sort in ("price", "price-desc"):
+            ordered = self._price_order(min_price, max_price, descending=sort == "price-desc")
+            if not price_filtered:
+                ordered = chain(ordered, self._unpriced())
+        else:
+            if price_filtered:
+                priced = set(self._price_order(min_price, max_price))
+                ids = priced if ids is None else ids & priced
+            if sort == "name":
+                ordered = iter(self._section("name_order"))
+            else:
+                ordered = iter(ids if ids is not None else self._all_ids())
+
+        selected = []
+        if ids is None or ids:
+            for pid in ordered:
+                if ids is not None and pid not in ids:
+                    continue
+                selected.append(pid)
+                if len(selected) == limit or (ids is not None and len(selected) == len(ids)):
+                    break
+        return self._fetch(selected)
+
+    def _price_order(self, min_price: float = None, max_price: float = None,
+                     descending: bool = False) -> Iterator[str]:
+        prices = self._section("prices")
+        lo = 0 if min_price is None else bisect.bisect_left(prices, [min_price, ""])
+        # Product ids are numeric strings, so "~" sorts after any id at the same price
+        hi = len(prices) if max_price is None else bisect.bisect_right(prices, [max_price, "~"])
+        positions = range(hi - 1, lo - 1, -1) if descending else range(lo, hi)
+        return (prices[i][1] for i in positions)
+
+    def _all_ids(self) -> Iterable[str]:
+        return self._section("offsets") if self.lazy else self.records
+
+    def _unpriced(self) -> Iterator[str]:
+        """Products without a retail_price, which sort after every priced one"""
+        priced = {pid for _, pid in self._section("prices")}
+        return (pid for pid in self._all_ids() if pid not in priced)
+
+    def _fetch(self, ids: List[str]) -> List[Dict]:
+        """Build result rows; a read-only index seeks to just these records on disk"""
+        if not self.lazy:
+            return [dict(self.records[pid], id=pid) for pid in ids]
+        offsets = self._section("offsets")
+        results = []
+        with open(self.path, "rb") as f:
+            for pid in ids:
+                position, length = offsets[pid]
+                f.seek(self._records_start + position)
+                results.append(json.loads(f.read(length)))
+        return results
+
+
+def _json_line(value) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8") + b"\n"
+
+
+def record_from_row(row: Dict) -> Dict:
+    """Build the compact indexed record from a CSV row of extract_product_data output"""
+    return {field: parse(row.get(field)) for field, parse in RECORD_FIELDS.items()}
+
+
+def is_discounted(record: Dict) -> bool:
+    return (record["old_price"] is not None and record["retail_price"] is not None
+            and record["old_price"] > record["retail_price"])
+
+
+def parse_bool(value: str) -> bool:
+    parsed = to_bool(value)
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"expected true/false, got {value!r}")
+    return parsed
+
+
+def cmd_index(args):
+    start = time.perf_counter()
+    index = BookIndex.load(args.index)
+    # Snapshot filenames carry a timestamp, so name order is arrival order
+    for csv_path in sorted(args.snapshots, key=os.path.basename):
+        if index.has_snapshot(csv_path):
+            print(f"Skipping {csv_path} (already indexed)")
+            continue
+        stats = index.ingest(csv_path)
+        print(f"Indexed {csv_path}: {stats['added']} added, {stats['updated']} updated, "
+              f"{stats['removed']} removed, {stats['unchanged']} unchanged")
+    index.save(args.index)
+    elapsed = (time.perf_counter() - start) * 1000
+    print(f"Index saved to {args.index} ({len(index.records)} products, {elapsed:.1f} ms)")
+
+
+def cmd_search(args):
+    if not os.path.exists(args.index):
+        raise SystemExit(f"No index at {args.index}; run '{os.path.basename(__file__)} index <csv>' first")
+
+    start = time.perf_counter()
+    index = BookIndex.load(args.index, records=False)
+    results = index.search(text=args.text, brand=args.brand, category=args.category, seller=args.seller,
+                           min_price=args.min_price, max_price=args.max_price,
+                           installment=args.installment, discounted=args.discounted,
+                           sort=args.sort, limit=args.limit)
+    elapsed = (time.perf_counter() - start) * 1000
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+        return
+
+    for r in results:
+        price = f"{r['retail_price']:.2f}" if r["retail_price"] is not None else "-"
+        old = f" (was {r['old_price']:.2f})" if is_discounted(r) else ""
+        print(f"{price:>8} AZN{old:<14} {r['seller_name'][:20]:<20} {r['id']:>8}  {r['name']}")
+    print(f"{len(results)} result(s) in {elapsed:.2f} ms (index load + query)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Indexed queries over scraped book snapshots")
+    parser.add_argument("--index", default=DEFAULT_INDEX, help=f"Index file (default: {DEFAULT_INDEX})")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    index_parser = subparsers.add_parser("index", help="Ingest one or more CSV snapshots")
+    index_parser.add_argument("snapshots", nargs="+", help="books_data_*.csv files from scrape_books.py")
+    index_parser.set_defaults(func=cmd_index)
+
+    search_parser = subparsers.add_parser("search", help="Query the index")
+    search_parser.add_argument("text", nargs="?", help="Words to match in title or brand")
+    search_parser.add_argument("--brand", help="Words that must appear in the brand")
+    search_parser.add_argument("--category", help="Exact category name")
+    search_parser.add_argument("--seller", help="Exact seller name")
+    search_parser.add_argument("--min-price", type=float)
+    search_parser.add_argument("--max-price", type=float)
+    search_parser.add_argument("--installment", type=parse_bool, help="true/false")
+    search_parser.add_argument("--discounted", action="store_true", help="Only books with old_price > retail_price")
+    search_parser.add_argument("--sort", choices=["price", "price-desc", "name"], default="price",
+                               help="Result order (default: price, cheapest first)")
+    search_parser.add_argument("--limit", type=int, default=20, help="0 for no limit")
+    search_parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    search_parser.set_defaults(func=cmd_search)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,27 +1,95 @@
+import argparse
 import asyncio
 import aiohttp
+import copy
 import csv
 import logging
+import logging.handlers
 import math
+import queue
 from typing import List, Dict
-from datetime import datetime
+from datetime import datetime, timezone
 import json
 
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler('scraping.log'),
-        logging.StreamHandler()
-    ]
-)
-
+# Handlers are attached by configure_logging() at run time, so importing
+# BookScraper as a library has no side effects (no scraping.log).
 logger = logging.getLogger(__name__)
 
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+# LogRecord attributes that are not user-supplied `extra` fields
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime', 'taskName'}
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, including any `extra` fields such as page/attempt"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update({k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class TracebackQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that ships the traceback as exc_text instead of folding it into the message.
+
+    The stock prepare() formats the whole record, traceback included, into
+    `message`, so a JSON formatter on the listener side could not tell the two
+    apart. Formatters render exc_text when exc_info is gone, so the text log
+    output is unchanged.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = logging.Formatter().formatException(record.exc_info)
+        # Copy so other handlers on the same logger still see the original record
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None  # as in the stock prepare(): only picklable text goes on the queue
+        record.exc_text = exc_text
+        return record
+
+
+def configure_logging(level: str = "INFO", log_file: str = "scraping.log",
+                      json_format: bool = False) -> logging.handlers.QueueListener:
+    """Route all logging through a queue so file/terminal writes happen on a listener thread.
+
+    The event loop only enqueues records; call .stop() on the returned listener
+    before exiting to flush what is still queued.
+    """
+    formatter = JsonFormatter() if json_format else logging.Formatter(LOG_FORMAT)
+    handlers = [logging.StreamHandler()]
+    if log_file:
+        handlers.append(logging.FileHandler(log_file, encoding='utf-8'))
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(TracebackQueueHandler(log_queue))
+    root.setLevel(level.upper())
+
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    listener.start()
+    return listener
+
 
 class BookScraper:
-    def __init__(self, total_pages: int = 295, per_page: int = 24):
+    def __init__(self, total_pages: int = 295, per_page: int = 24, log_every: int = 1):
         self.base_url = "https://mp-catalog.umico.az/api/v1/products"
         self.total_pages = total_pages
         self.per_page = per_page
@@ -38,6 +106,8 @@ class BookScraper:
         self.all_products = []
         self.failed_pages = []
         self.semaphore = asyncio.Semaphore(10)  # Limit concurrent requests
+        self.log_every = log_every  # Log every Nth successful page; 0 disables per-page success logs
+        self.pages_fetched = 0
 
     async def get_total_count(self) -> int:
         """Get total number of products from API"""
@@ -64,19 +134,26 @@ class BookScraper:
                     async with session.get(url, headers=self.headers, timeout=30) as response:
                         if response.status == 200:
                             data = await response.json()
-                            logger.info(f"Successfully fetched page {page}/{self.total_pages}")
+                            self.pages_fetched += 1
+                            if self.log_every and self.pages_fetched % self.log_every == 0:
+                                logger.info("Successfully fetched page %d/%d (%d done)", page, self.total_pages,
+                                            self.pages_fetched, extra={"page": page, "pages_fetched": self.pages_fetched})
                             return {"page": page, "data": data}
                         else:
-                            logger.warning(f"Page {page} returned status {response.status}, attempt {attempt + 1}/{retry}")
+                            logger.warning("Page %d returned status %d, attempt %d/%d", page, response.status,
+                                           attempt + 1, retry,
+                                           extra={"page": page, "status": response.status, "attempt": attempt + 1})
             except asyncio.TimeoutError:
-                logger.warning(f"Timeout on page {page}, attempt {attempt + 1}/{retry}")
+                logger.warning("Timeout on page %d, attempt %d/%d", page, attempt + 1, retry,
+                               extra={"page": page, "attempt": attempt + 1})
             except Exception as e:
-                logger.error(f"Error fetching page {page}, attempt {attempt + 1}/{retry}: {str(e)}")
+                logger.error("Error fetching page %d, attempt %d/%d: %s", page, attempt + 1, retry, e,
+                             extra={"page": page, "attempt": attempt + 1})
 
             if attempt < retry - 1:
                 await asyncio.sleep(2 ** attempt)  # Exponential backoff
 
-        logger.error(f"Failed to fetch page {page} after {retry} attempts")
+        logger.error("Failed to fetch page %d after %d attempts", page, retry, extra={"page": page})
         self.failed_pages.append(page)
         return {"page": page, "data": None}
 
@@ -224,10 +301,23 @@ class BookScraper:
         print("="*50)
 
 
-async def main():
-    scraper = BookScraper(total_pages=295, per_page=24)
+async def main(log_every: int = 1):
+    scraper = BookScraper(total_pages=295, per_page=24, log_every=log_every)
     await scraper.run()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    parser = argparse.ArgumentParser(description="Scrape the books catalogue to CSV")
+    parser.add_argument("--log-level", default="INFO", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--log-file", default="scraping.log", help="Log file path; empty string for terminal only")
+    parser.add_argument("--log-json", action="store_true", help="Write logs as JSON lines")
+    parser.add_argument("--log-every", type=int, default=1,
+                        help="Log every Nth successfully fetched page (0 = none); retries are logged at WARNING "
+                             "and failures at ERROR, so --log-level still applies to them")
+    args = parser.parse_args()
+
+    listener = configure_logging(args.log_level, args.log_file, args.log_json)
+    try:
+        asyncio.run(main(log_every=args.log_every))
+    finally:
+        listener.stop()
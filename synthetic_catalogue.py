@@ -0,0 +1,76 @@
+import argparse
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+SOURCE_FILE = 'books_data_20251202_231851.csv'
+OUTPUT_DIR = 'synthetic'
+CHUNK_ROWS = 100_000
+
+
+def synthetic_path(scale, output_dir=OUTPUT_DIR):
+    return os.path.join(output_dir, f'books_synthetic_x{scale}.csv')
+
+
+def generate_chunk(source, n_rows, start_serial, first_id, rng):
+    """Bootstrap n_rows from the real catalogue and make each row a distinct product.
+
+    Whole rows are resampled so the joint distribution of category, seller,
+    brand, price, rating and installment terms matches the source file.
+    Identity columns are regenerated and prices get a small jitter so
+    aggregations don't collapse onto the original 7k distinct values.
+    """
+    chunk = source.iloc[rng.integers(0, len(source), size=n_rows)].reset_index(drop=True)
+    serial = pd.Series(np.arange(start_serial, start_serial + n_rows)).astype(str)
+
+    chunk['id'] = first_id + start_serial + np.arange(n_rows)
+    chunk['name'] = chunk['name'] + ' #' + serial
+    chunk['slugged_name'] = chunk['slugged_name'] + '-' + serial
+    chunk['offer_uuid'] = [str(uuid.UUID(bytes=rng.bytes(16), version=4)) for _ in range(n_rows)]
+
+    # Jitter prices by ~5% and keep each sampled row's discount ratio
+    discounted = chunk['old_price'] > chunk['retail_price']
+    discount_ratio = (chunk['retail_price'] / chunk['old_price']).where(discounted)
+    jitter = rng.lognormal(mean=0.0, sigma=0.05, size=n_rows)
+    chunk['retail_price'] = (chunk['retail_price'] * jitter).round(2).clip(lower=0.01)
+    chunk['old_price'] = (chunk['retail_price'] / discount_ratio).round(2).where(discounted, chunk['old_price'])
+    return chunk
+
+
+def write_catalogue(scale, source_path=SOURCE_FILE, output_path=None, seed=42, chunk_rows=CHUNK_ROWS):
+    """Write a synthetic catalogue with len(source) * scale rows, chunk by chunk"""
+    source = pd.read_csv(source_path)
+    output_path = output_path or synthetic_path(scale)
+    os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+
+    rng = np.random.default_rng(seed)
+    total_rows = len(source) * scale
+    first_id = int(source['id'].max()) + 1
+
+    # One handle for all chunks so the utf-8-sig BOM is written only once
+    with open(output_path, 'w', newline='', encoding='utf-8-sig') as csvfile:
+        for start in range(0, total_rows, chunk_rows):
+            n_rows = min(chunk_rows, total_rows - start)
+            chunk = generate_chunk(source, n_rows, start, first_id, rng)
+            chunk.to_csv(csvfile, index=False, header=(start == 0))
+
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Generate synthetic book catalogues at a multiple of the real file size')
+    parser.add_argument('--scales', type=int, nargs='+', default=[10, 100, 1000], help='Row multipliers (default: 10 100 1000)')
+    parser.add_argument('--source', default=SOURCE_FILE, help=f'Real catalogue to sample from (default: {SOURCE_FILE})')
+    parser.add_argument('--output-dir', default=OUTPUT_DIR, help=f'Where to write the files (default: {OUTPUT_DIR}/)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    for scale in args.scales:
+        path = write_catalogue(scale, args.source, synthetic_path(scale, args.output_dir), seed=args.seed)
+        print(f"✓ Saved: {path} ({scale}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,167 @@
+import argparse
+import json
+import sys
+
+import pandas as pd
+
+# Column -> rules for the fields written by BookScraper.extract_product_data.
+#   type:     int | float | bool | str | datetime
+#   required: value must be present
+#   unique:   no two rows may share a value
+#   min/max:  inclusive numeric range
+#   absent:   sentinel values that mean "not set" (the API sends old_price=0 when there is no old price)
+SCHEMA = {
+    'id': {'type': 'int', 'required': True, 'unique': True, 'min': 1},
+    'name': {'type': 'str', 'required': True},
+    'slugged_name': {'type': 'str'},
+    'status': {'type': 'str'},
+    'brand': {'type': 'str'},
+    'category_id': {'type': 'int', 'min': 1},
+    'category_name': {'type': 'str', 'required': True},
+    'retail_price': {'type': 'float', 'required': True, 'min': 0.01},
+    'old_price': {'type': 'float', 'min': 0, 'absent': [0]},
+    'discount_start_date': {'type': 'datetime'},
+    'discount_end_date': {'type': 'datetime'},
+    'installment_enabled': {'type': 'bool', 'required': True},
+    'max_installment_months': {'type': 'int', 'min': 0, 'max': 60},
+    'seller_ext_id': {'type': 'str'},
+    'seller_name': {'type': 'str', 'required': True},
+    'seller_rating': {'type': 'float', 'min': 0, 'max': 100},
+    'seller_vat_payer': {'type': 'bool'},
+    'seller_role': {'type': 'str'},
+    'rating_value': {'type': 'float', 'min': 0, 'max': 5},
+    'rating_count': {'type': 'int', 'min': 0},
+    'assessment_id': {'type': 'int'},
+    'image_big': {'type': 'str'},
+    'image_medium': {'type': 'str'},
+    'image_small': {'type': 'str'},
+    'avail_check': {'type': 'bool'},
+    'preorder_available': {'type': 'bool'},
+    'min_qty': {'type': 'int', 'min': 0},
+    'qty': {'type': 'int', 'min': 0},
+    'show_stock_qty_threshold': {'type': 'int', 'min': 0},
+    'offer_uuid': {'type': 'str'},
+    'product_labels': {'type': 'str'},
+    'offer_labels': {'type': 'str'},
+}
+
+# (left, operator, right): checked only on rows where both sides are set
+CROSS_FIELD_RULES = [
+    ('old_price', '>=', 'retail_price'),
+    ('discount_end_date', '>=', 'discount_start_date'),
+]
+
+BOOL_VALUES = {True: True, False: False, 'True': True, 'False': False, 'true': True, 'false': False}
+OPERATORS = {'>=': pd.Series.ge, '>': pd.Series.gt, '<=': pd.Series.le, '<': pd.Series.lt}
+MAX_EXAMPLES = 3
+
+
+def parse_column(raw, column_type):
+    """Parse a whole column at once; returns (parsed values, mask of present-but-unparseable cells)"""
+    if column_type == 'str':
+        # Any value is a valid string; skip the null scan, which dominates on text columns
+        return raw, None
+
+    present = raw.notna()
+    if column_type in ('int', 'float'):
+        # read_csv already typed clean columns; only object columns need parsing
+        parsed = raw if pd.api.types.is_numeric_dtype(raw) else pd.to_numeric(raw, errors='coerce')
+        invalid = present & parsed.isna()
+        if column_type == 'int' and not pd.api.types.is_integer_dtype(parsed):
+            invalid |= parsed.notna() & (parsed % 1 != 0)
+    elif column_type == 'bool':
+        parsed = raw if pd.api.types.is_bool_dtype(raw) else raw.map(BOOL_VALUES)
+        invalid = present & parsed.isna()
+    elif column_type == 'datetime':
+        parsed = pd.to_datetime(raw, errors='coerce', utc=True)
+        invalid = present & parsed.isna()
+    return parsed, invalid
+
+
+def validate(df, schema=SCHEMA, rules=CROSS_FIELD_RULES):
+    """Check every column of df against the schema; returns a list of violation dicts"""
+    violations = []
+    ids = df['id'] if 'id' in df.columns else pd.Series(df.index, index=df.index)
+
+    def record(column, check, mask):
+        count = int(mask.sum())
+        if count:
+            violations.append({
+                'column': column,
+                'check': check,
+                'count': count,
+                'examples': [str(v) for v in ids[mask].head(MAX_EXAMPLES)],
+            })
+
+    parsed = {}
+    for column, spec in schema.items():
+        if column not in df.columns:
+            violations.append({'column': column, 'check': 'missing column', 'count': len(df), 'examples': []})
+            continue
+
+        raw = df[column]
+        values, invalid = parse_column(raw, spec['type'])
+        if invalid is not None:
+            record(column, f"not {spec['type']}", invalid)
+        if 'absent' in spec:
+            # Match sentinels on parsed values: one bad cell leaves the whole column as text ('0.0')
+            values = values.mask(values.isin(spec['absent']))
+        parsed[column] = values
+
+        if spec.get('required'):
+            # Unparseable cells are already reported as 'not <type>'
+            record(column, 'missing value', values.isna() if invalid is None else values.isna() & ~invalid)
+        if spec.get('unique'):
+            record(column, 'duplicate', raw.notna() & raw.duplicated(keep=False))
+        if 'min' in spec:
+            record(column, f"< {spec['min']}", values < spec['min'])
+        if 'max' in spec:
+            record(column, f"> {spec['max']}", values > spec['max'])
+
+    for left, op, right in rules:
+        if left not in parsed or right not in parsed:
+            continue
+        both = parsed[left].notna() & parsed[right].notna()
+        record(left, f'{left} {op} {right}', both & ~OPERATORS[op](parsed[left], parsed[right]))
+
+    return violations
+
+
+def format_report(violations, rows, source=''):
+    label = f"{source}: " if source else ''
+    if not violations:
+        return f"✓ {label}{rows} records, no schema violations"
+
+    lines = [f"⚠️  {label}{rows} records, {len(violations)} schema violation(s)"]
+    for v in violations:
+        examples = f"  e.g. id {', '.join(v['examples'])}" if v['examples'] else ''
+        lines.append(f"  - {v['column']:<24} {v['check']:<42} {v['count']:>7} rows{examples}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Validate scraped book CSVs against the extract_product_data schema')
+    parser.add_argument('files', nargs='+', help='books_data_*.csv files')
+    parser.add_argument('--json', action='store_true', help='Print violations as JSON')
+    parser.add_argument('--strict', action='store_true', help='Exit with status 1 if any file has violations')
+    args = parser.parse_args()
+
+    failed = False
+    results = {}
+    for path in args.files:
+        df = pd.read_csv(path)
+        violations = validate(df)
+        failed |= bool(violations)
+        results[path] = {'rows': len(df), 'violations': violations}
+        if not args.json:
+            print(format_report(violations, len(df), source=path))
+
+    if args.json:
+        print(json.dumps(results, ensure_ascii=False, indent=2))
+
+    if args.strict and failed:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()